@@ -6,28 +6,129 @@ decomposed queries from the Query Agent into contextual data by leveraging the M
 """
 
 import json
+import asyncio
 import logging
-from typing import Dict, List, Any, Optional
+import functools
+from dataclasses import dataclass, field
+from types import MappingProxyType
+from typing import Dict, List, Any, Optional, Mapping, Tuple, Set
 
 # Assuming this will be created in the project
 from text2sql.metastore.metastore import MetaStore
+from text2sql.agents.context_agent.semantic_cache import SemanticSearchCache
+from text2sql.agents.context_agent.models import (
+    ContextualData, FilterSpec, OutputColumn, TableMeta
+)
 
 logger = logging.getLogger(__name__)
 
+# Simple mapping of entity types to operators
+# This would be expanded based on the system's entity type taxonomy
+_OPERATOR_MAP: Mapping[str, str] = MappingProxyType({
+    "status": "=",
+    "priority": "=",
+    "category": "=",
+    "type": "=",
+    "count": ">",
+    "amount": ">",
+    "limit": "<="
+})
+
+
+# Maximum number of key columns returned for count/aggregate intents
+_MAX_KEY_COLUMNS = 5
+
+# Fields that must be present and non-empty in the final contextual data
+_REQUIRED_FIELDS: Tuple[str, ...] = ("intent", "context", "filters", "table_metadata", "output_columns")
+
+
+@functools.lru_cache(maxsize=4096)
+def _format_column_name_cached(column_name: str) -> str:
+    """Convert a snake_case column name into a Title Case display name."""
+    return column_name.replace("_", " ").title()
+
+
+@dataclass
+class DecompositionSummary:
+    """
+    The parts of a decomposed query the enricher needs, collected in one pass.
+    """
+    intent: str = ""
+    description: str = ""
+    expected_output: str = ""
+    # (entity_type, entity_value, mapped_column) per extracted entity
+    entities: List[Tuple[str, str, str]] = field(default_factory=list)
+    temporal: Dict[str, Any] = field(default_factory=dict)
+    # Indices into entities that still need a column mapping
+    unmapped: List[int] = field(default_factory=list)
+    # Tables named explicitly by entities, if any
+    explicit_tables: Set[str] = field(default_factory=set)
+    search_query: str = ""
+    # Set when the primary table was resolved without a schema search
+    short_circuited: bool = False
+
+
 class ContextEnricher:
     """
     The ContextEnricher is responsible for enriching decomposed queries with
     schema metadata from the MetaStore to produce contextual data for SQL generation.
     """
     
-    def __init__(self, metastore: MetaStore):
+    def __init__(self, metastore: MetaStore,
+                 search_cache: Optional[SemanticSearchCache] = None):
         """
         Initialize the ContextEnricher with a MetaStore instance.
         
         Args:
             metastore: An instance of MetaStore for retrieving database metadata
+            search_cache: Optional cache for schema searches; disabled when None
         """
         self.metastore = metastore
+        self.search_cache = search_cache
+        if search_cache is not None and search_cache.embed_fn is None:
+            # The MetaStore caches the embedding, so a missed search does not embed again
+            search_cache.embed_fn = metastore.embed_query
+    
+    def invalidate(self) -> None:
+        """
+        Drop cached schema searches, e.g. after the MetaStore is reindexed.
+        
+        Table metadata needs no invalidation here: it is memoized by the
+        MetaStore, which rebuilds it when the schema is indexed again.
+        """
+        if self.search_cache is not None:
+            self.search_cache.invalidate()
+    
+    def _search_schema_batch(self, queries: List[str], k: int,
+                             filter: Optional[Dict[str, Any]] = None) -> List[List[Dict[str, Any]]]:
+        """
+        Search the MetaStore schema index for several queries in one call,
+        consulting the search cache first.
+        
+        Args:
+            queries: The search queries
+            k: Number of results to return per query
+            filter: Optional metadata filter applied to every query
+            
+        Returns:
+            One list of matching schema elements per query, in input order
+        """
+        results: List[Optional[List[Dict[str, Any]]]] = [None] * len(queries)
+        if self.search_cache is not None:
+            for i, query in enumerate(queries):
+                results[i] = self.search_cache.get(query, k, filter)
+        
+        misses = [i for i, result in enumerate(results) if result is None]
+        if misses:
+            fetched = self.metastore.search_schema_batch(
+                [queries[i] for i in misses], k=k, filter=filter
+            )
+            for i, result in zip(misses, fetched):
+                results[i] = result
+                if self.search_cache is not None and result:
+                    self.search_cache.put(queries[i], k, filter, result)
+        
+        return results
     
     def enrich_query(self, decomposed_query: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -41,80 +142,217 @@ class ContextEnricher:
         """
         logger.info("Enriching decomposed query with context")
         
-        # Initialize the contextual data structure
-        contextual_data = self._initialize_contextual_data(decomposed_query)
+        # Read everything needed from the decomposed query in a single pass
+        summary = self._walk_decomposition(decomposed_query)
+        
+        # Determine the primary table based on intent and entities
+        primary_table = self._determine_primary_table(summary)
+        
+        return self._build_contextual_data(summary, primary_table)
+    
+    def enrich_queries_batch(self, decomposed_queries: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Transform several decomposed queries into enriched contextual data.
+        
+        The primary-table searches for all queries are issued as a single
+        batched MetaStore call; the rest of the enrichment runs per query.
+        
+        Args:
+            decomposed_queries: Structured outputs from the Query Agent
+            
+        Returns:
+            One contextual data dictionary per query, in input order
+        """
+        logger.info(f"Enriching {len(decomposed_queries)} decomposed queries with context")
+        
+        summaries = [self._walk_decomposition(query) for query in decomposed_queries]
+        primary_tables = self._determine_primary_tables(summaries)
+        
+        return [
+            self._build_contextual_data(summary, primary_table)
+            for summary, primary_table in zip(summaries, primary_tables)
+        ]
+    
+    async def aenrich_query(self, decomposed_query: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Asynchronously transform a decomposed query into enriched contextual data.
+        
+        Once the primary table is known, table metadata, filters and output
+        columns are resolved concurrently, since each only depends on the table.
+        The blocking MetaStore calls run in the event loop's default executor.
+        
+        Args:
+            decomposed_query: The structured output from the Query Agent
+            
+        Returns:
+            A dictionary containing the enriched contextual data for SQL generation
+        """
+        logger.info("Enriching decomposed query with context")
+        loop = asyncio.get_running_loop()
+        
+        # Read everything needed from the decomposed query in a single pass
+        summary = self._walk_decomposition(decomposed_query)
         
         # Determine the primary table based on intent and entities
-        primary_table = self._determine_primary_table(decomposed_query)
+        primary_table = await loop.run_in_executor(None, self._determine_primary_table, summary)
+        
+        table_metadata, filters, output_columns = await asyncio.gather(
+            loop.run_in_executor(None, self._get_table_metadata, primary_table),
+            loop.run_in_executor(None, self._build_filters, summary, primary_table),
+            loop.run_in_executor(None, self._determine_output_columns, summary, primary_table)
+        )
         
-        # Add table metadata to contextual data
-        contextual_data["table_metadata"] = self._get_table_metadata(primary_table)
+        return self._assemble_contextual_data(summary, table_metadata, filters, output_columns)
+    
+    def _build_contextual_data(self, summary: DecompositionSummary, primary_table: str) -> Dict[str, Any]:
+        """
+        Build and validate the contextual data for a query once its primary table is known.
         
-        # Build filters from entity extraction and temporal filtering
-        contextual_data["filters"] = self._build_filters(decomposed_query, primary_table)
+        Args:
+            summary: The single-pass summary of the decomposed query
+            primary_table: The name of the primary table
+            
+        Returns:
+            A dictionary containing the enriched contextual data for SQL generation
+        """
+        return self._assemble_contextual_data(
+            summary,
+            # Add table metadata to contextual data
+            self._get_table_metadata(primary_table),
+            # Build filters from entity extraction and temporal filtering
+            self._build_filters(summary, primary_table),
+            # Determine output columns based on the expected output and intent
+            self._determine_output_columns(summary, primary_table)
+        )
+    
+    def _assemble_contextual_data(self, summary: DecompositionSummary, table_metadata: TableMeta,
+                                  filters: List[FilterSpec],
+                                  output_columns: List[OutputColumn]) -> Dict[str, Any]:
+        """
+        Combine the enrichment results into validated contextual data.
         
-        # Determine output columns based on the expected output and intent
-        contextual_data["output_columns"] = self._determine_output_columns(
-            decomposed_query, primary_table
+        Args:
+            summary: The single-pass summary of the decomposed query
+            table_metadata: Metadata for the primary table
+            filters: Filters built from entities and temporal filtering
+            output_columns: Columns to include in the output
+            
+        Returns:
+            A dictionary containing the enriched contextual data for SQL generation
+        """
+        contextual_data = ContextualData(
+            intent=summary.intent,
+            context={
+                "description": summary.description,
+                "expected_output": summary.expected_output
+            },
+            short_circuited=summary.short_circuited,
+            table_metadata=table_metadata,
+            filters=filters,
+            output_columns=output_columns
         )
         
         # Validate the completeness of the contextual data
         self._validate_contextual_data(contextual_data)
         
-        return contextual_data
+        # Convert to plain dictionaries once, at the JSON boundary
+        return contextual_data.to_dict()
     
-    def _initialize_contextual_data(self, decomposed_query: Dict[str, Any]) -> Dict[str, Any]:
+    def _walk_decomposition(self, decomposed_query: Dict[str, Any]) -> DecompositionSummary:
         """
-        Initialize the basic structure of the contextual data from the decomposed query.
+        Collect intent, context, entities and temporal filtering from the
+        decomposed query with a single traversal.
         
         Args:
             decomposed_query: The structured output from the Query Agent
             
         Returns:
-            A dictionary with the basic contextual data structure
+            A DecompositionSummary shared by the later enrichment steps
         """
         decomp = decomposed_query.get("query_decomposition", {})
+        context = decomp.get("context", {})
+        summary = DecompositionSummary(
+            intent=decomp.get("intent", {}).get("goal", ""),
+            description=context.get("description", ""),
+            expected_output=context.get("expected_output", ""),
+            temporal=decomp.get("temporal_filtering", {})
+        )
         
-        return {
-            "intent": decomp.get("intent", {}).get("goal", ""),
-            "context": {
-                "description": decomp.get("context", {}).get("description", ""),
-                "expected_output": decomp.get("context", {}).get("expected_output", "")
-            }
-        }
+        search_tokens = [summary.intent]
+        for entity in decomp.get("entity_extraction", []):
+            entity_type = entity.get("entity_type", "")
+            entity_value = entity.get("entity_value", "")
+            mapped_column = entity.get("mapped_column", "")
+            
+            if not mapped_column:
+                summary.unmapped.append(len(summary.entities))
+            if entity.get("table"):
+                summary.explicit_tables.add(entity["table"])
+            summary.entities.append((entity_type, entity_value, mapped_column))
+            search_tokens.append(entity_type)
+            search_tokens.append(entity_value)
+        
+        # Combine intent and entities for semantic search, dropping empty values
+        # so they don't add blank tokens to the embedded query
+        summary.search_query = " ".join(token for token in search_tokens if token)
+        
+        return summary
     
-    def _determine_primary_table(self, decomposed_query: Dict[str, Any]) -> str:
+    def _determine_primary_table(self, summary: DecompositionSummary) -> str:
         """
         Determine the primary table for the query using intent and entities.
         
         Args:
-            decomposed_query: The structured output from the Query Agent
+            summary: The single-pass summary of the decomposed query
             
         Returns:
             The name of the primary table
         """
-        decomp = decomposed_query.get("query_decomposition", {})
-        intent = decomp.get("intent", {}).get("goal", "")
-        
-        # Extract entities for vector search
-        entities = []
-        for entity in decomp.get("entity_extraction", []):
-            entities.append(entity.get("entity_type", ""))
-            entities.append(entity.get("entity_value", ""))
+        return self._determine_primary_tables([summary])[0]
+    
+    def _determine_primary_tables(self, summaries: List[DecompositionSummary]) -> List[str]:
+        """
+        Determine the primary table for several queries with one batched search.
         
-        # Combine intent and entities for semantic search
-        search_query = f"{intent} {' '.join(entities)}"
+        Args:
+            summaries: Single-pass summaries of the decomposed queries
+            
+        Returns:
+            The name of the primary table for each query, in input order
+        """
+        primary_tables: List[Optional[str]] = [None] * len(summaries)
+        to_search = []
+        
+        for i, summary in enumerate(summaries):
+            # Entities that all name the same table need no semantic search
+            if len(summary.explicit_tables) == 1:
+                summary.short_circuited = True
+                primary_tables[i] = next(iter(summary.explicit_tables))
+            
+            # Nothing to search on; use the MetaStore's default table if it has one
+            elif not summary.search_query:
+                if not self.metastore.default_table:
+                    raise ValueError("No relevant tables found for the query")
+                primary_tables[i] = self.metastore.default_table
+            
+            else:
+                to_search.append(i)
         
         # Search for relevant tables in the MetaStore
-        relevant_tables = self.metastore.search_schema(search_query, top_k=3)
+        search_results = self._search_schema_batch(
+            [summaries[i].search_query for i in to_search], k=3
+        ) if to_search else []
         
-        if not relevant_tables:
-            raise ValueError("No relevant tables found for the query")
+        for i, relevant_tables in zip(to_search, search_results):
+            if not relevant_tables:
+                raise ValueError("No relevant tables found for the query")
+            
+            # Use the table of the most relevant schema element
+            primary_tables[i] = relevant_tables[0]["metadata"]["table_name"]
         
-        # Return the most relevant table
-        return relevant_tables[0]["name"]
+        return primary_tables
     
-    def _get_table_metadata(self, table_name: str) -> Dict[str, Any]:
+    def _get_table_metadata(self, table_name: str) -> TableMeta:
         """
         Retrieve metadata for the primary table.
         
@@ -122,70 +360,67 @@ class ContextEnricher:
             table_name: The name of the primary table
             
         Returns:
-            A dictionary containing table metadata
+            The primary table's metadata
         """
         table_metadata = self.metastore.get_table_metadata(table_name)
         
         if not table_metadata:
             raise ValueError(f"No metadata found for table {table_name}")
         
-        # Format the table fields
-        table_fields = {}
-        for column in table_metadata.get("columns", []):
-            table_fields[column["name"]] = column["data_type"]
-        
-        return {
-            "primary_table": table_name,
-            "table_description": table_metadata.get("description", ""),
-            "table_fields": table_fields
-        }
+        # The {name: data_type} map is precomputed by the MetaStore; it is not
+        # mutated downstream, so it is shared rather than copied
+        return TableMeta(
+            primary_table=table_name,
+            table_description=table_metadata.get("description", ""),
+            table_fields=table_metadata["field_types"]
+        )
     
-    def _build_filters(self, decomposed_query: Dict[str, Any], table_name: str) -> List[Dict[str, Any]]:
+    def _build_filters(self, summary: DecompositionSummary, table_name: str) -> List[FilterSpec]:
         """
         Build filters from entity extraction and temporal filtering.
         
         Args:
-            decomposed_query: The structured output from the Query Agent
+            summary: The single-pass summary of the decomposed query
             table_name: The name of the primary table
             
         Returns:
-            A list of filter dictionaries
+            A list of filter specifications
         """
         filters = []
-        decomp = decomposed_query.get("query_decomposition", {})
+        entities = summary.entities
+        
+        # Map every entity lacking a mapped column with one batched MetaStore search
+        mapped_columns = self._map_entities_to_columns(
+            [entities[i][:2] for i in summary.unmapped], table_name
+        )
+        resolved = dict(zip(summary.unmapped, mapped_columns))
         
         # Process entity extraction for filters
-        for entity in decomp.get("entity_extraction", []):
-            entity_type = entity.get("entity_type", "")
-            entity_value = entity.get("entity_value", "")
-            mapped_column = entity.get("mapped_column", "")
-            
-            # If no mapped column, try to find it using the MetaStore
-            if not mapped_column:
-                mapped_column = self._map_entity_to_column(entity_type, entity_value, table_name)
+        for i, (entity_type, entity_value, mapped_column) in enumerate(entities):
+            mapped_column = mapped_column or resolved[i]
             
             # Determine appropriate operator
             operator = self._determine_operator(entity_type, entity_value)
             
-            filters.append({
-                "filter_name": entity_type,
-                "column_name": mapped_column,
-                "operator": operator,
-                "value": entity_value
-            })
+            filters.append(FilterSpec(
+                filter_name=entity_type,
+                column_name=mapped_column,
+                operator=operator,
+                value=entity_value
+            ))
         
         # Process temporal filtering if present
-        temporal = decomp.get("temporal_filtering", {})
+        temporal = summary.temporal
         if temporal:
             date_column = self._find_date_column(table_name)
             
             if date_column:
-                filters.append({
-                    "filter_name": "date_range",
-                    "column_name": date_column,
-                    "operator": "BETWEEN",
-                    "value": temporal.get("value", [])
-                })
+                filters.append(FilterSpec(
+                    filter_name="date_range",
+                    column_name=date_column,
+                    operator="BETWEEN",
+                    value=temporal.get("value", [])
+                ))
         
         return filters
     
@@ -201,19 +436,40 @@ class ContextEnricher:
         Returns:
             The name of the mapped column
         """
+        return self._map_entities_to_columns([(entity_type, entity_value)], table_name)[0]
+    
+    def _map_entities_to_columns(self, entities: List[Tuple[str, str]], table_name: str) -> List[str]:
+        """
+        Map several entities to database columns with a single batched search.
+        
+        Args:
+            entities: (entity_type, entity_value) pairs to map
+            table_name: The name of the table
+            
+        Returns:
+            The names of the mapped columns, in input order
+        """
+        if not entities:
+            return []
+        
         # Search in column metadata
-        query = f"{entity_type} {entity_value}"
-        columns = self.metastore.search_schema(query, filter={"table": table_name}, top_k=3)
-        
-        if not columns:
-            # If no columns found by semantic search, try table heads
-            sample_matches = self.metastore.search_table_heads(entity_value, table_name=table_name)
-            if sample_matches and sample_matches[0].get("column_name"):
-                return sample_matches[0]["column_name"]
-            raise ValueError(f"Could not map entity {entity_type}:{entity_value} to a column")
-        
-        # Return the highest scoring column match
-        return columns[0]["name"]
+        queries = [f"{entity_type} {entity_value}" for entity_type, entity_value in entities]
+        column_results = self._search_schema_batch(queries, k=3, filter={"table": table_name})
+        
+        mapped_columns = []
+        for (entity_type, entity_value), columns in zip(entities, column_results):
+            if not columns:
+                # If no columns found by semantic search, try table heads
+                sample_matches = self.metastore.search_table_heads(entity_value, table_name=table_name)
+                if sample_matches and sample_matches[0].get("column_name"):
+                    mapped_columns.append(sample_matches[0]["column_name"])
+                    continue
+                raise ValueError(f"Could not map entity {entity_type}:{entity_value} to a column")
+            
+            # Use the highest scoring column match
+            mapped_columns.append(columns[0]["name"])
+        
+        return mapped_columns
     
     def _determine_operator(self, entity_type: str, entity_value: Any) -> str:
         """
@@ -226,20 +482,8 @@ class ContextEnricher:
         Returns:
             The SQL operator to use
         """
-        # Simple mapping of entity types to operators
-        # This would be expanded based on the system's entity type taxonomy
-        operator_map = {
-            "status": "=",
-            "priority": "=",
-            "category": "=",
-            "type": "=",
-            "count": ">",
-            "amount": ">",
-            "limit": "<="
-        }
-        
         # Default to equality for most entity types
-        return operator_map.get(entity_type, "=")
+        return _OPERATOR_MAP.get(entity_type, "=")
     
     def _find_date_column(self, table_name: str) -> Optional[str]:
         """
@@ -251,41 +495,24 @@ class ContextEnricher:
         Returns:
             The name of the date column, or None if not found
         """
-        table_metadata = self.metastore.get_table_metadata(table_name)
-        
-        if not table_metadata:
-            return None
-        
-        # Look for date/time columns
-        date_columns = []
-        for column in table_metadata.get("columns", []):
-            data_type = column.get("data_type", "").upper()
-            column_name = column.get("name", "")
-            
-            # Check data type or name patterns for date columns
-            if any(dt in data_type for dt in ["DATE", "TIME", "TIMESTAMP"]):
-                date_columns.append(column_name)
-            elif any(pattern in column_name.lower() for pattern in ["date", "time", "created", "updated", "timestamp"]):
-                date_columns.append(column_name)
-        
-        return date_columns[0] if date_columns else None
+        # Precomputed by the MetaStore when the schema is indexed
+        return self.metastore.get_date_column(table_name)
     
-    def _determine_output_columns(self, decomposed_query: Dict[str, Any], table_name: str) -> List[Dict[str, Any]]:
+    def _determine_output_columns(self, summary: DecompositionSummary, table_name: str) -> List[OutputColumn]:
         """
         Determine which columns should be included in the output based on intent and expected output.
         
         Args:
-            decomposed_query: The structured output from the Query Agent
+            summary: The single-pass summary of the decomposed query
             table_name: The name of the primary table
             
         Returns:
-            A list of output column dictionaries
+            A list of output columns
         """
-        decomp = decomposed_query.get("query_decomposition", {})
-        intent = decomp.get("intent", {}).get("goal", "")
-        expected_output = decomp.get("context", {}).get("expected_output", "")
+        intent = summary.intent
+        expected_output = summary.expected_output
         
-        # Get the table metadata
+        # Get the table metadata (memoized by the MetaStore)
         table_metadata = self.metastore.get_table_metadata(table_name)
         if not table_metadata:
             raise ValueError(f"No metadata found for table {table_name}")
@@ -303,22 +530,14 @@ class ContextEnricher:
             relevant_columns = table_metadata.get("columns", [])
         
         # Format the output columns
-        output_columns = []
-        for column in relevant_columns:
-            output_column = {
-                "column_name": column["name"],
-                "alias": column.get("display_name", self._format_column_name(column["name"])),
-                "column_description": column.get("description", ""),
-                "column_fields": {
-                    "data_type": column["data_type"],
-                    "nullable": column.get("nullable", True)
-                }
-            }
-            output_columns.append(output_column)
-        
-        return output_columns
+        return [
+            self._make_output_column(
+                column, column.get("display_name") or self._format_column_name(column["name"])
+            )
+            for column in relevant_columns
+        ]
     
-    def _get_key_columns(self, table_metadata: Dict[str, Any]) -> List[Dict[str, Any]]:
+    def _get_key_columns(self, table_metadata: Dict[str, Any]) -> List[OutputColumn]:
         """
         Get primary key and important columns for aggregate queries.
         
@@ -326,25 +545,32 @@ class ContextEnricher:
             table_metadata: Metadata for the table
             
         Returns:
-            A list of key column dictionaries formatted for output
-        """
-        key_columns = []
-        
-        # Find primary key or important columns
-        for column in table_metadata.get("columns", []):
-            if column.get("is_primary_key", False) or "id" in column["name"].lower():
-                key_column = {
-                    "column_name": column["name"],
-                    "alias": self._format_column_name(column["name"]),
-                    "column_description": column.get("description", ""),
-                    "column_fields": {
-                        "data_type": column["data_type"],
-                        "nullable": column.get("nullable", True)
-                    }
-                }
-                key_columns.append(key_column)
-        
-        return key_columns
+            A list of at most _MAX_KEY_COLUMNS key columns formatted for output
+        """
+        # Primary key and ID columns, classified once by the MetaStore
+        return [
+            self._make_output_column(column, self._format_column_name(column["name"]))
+            for column in table_metadata["columns_by_role"]["key"][:_MAX_KEY_COLUMNS]
+        ]
+    
+    def _make_output_column(self, column: Dict[str, Any], alias: str) -> OutputColumn:
+        """
+        Build an output column from a column metadata entry.
+        
+        Args:
+            column: Column metadata from the MetaStore
+            alias: Display name for the column
+            
+        Returns:
+            The output column
+        """
+        return OutputColumn(
+            column["name"],
+            alias,
+            column.get("description", ""),
+            column["data_type"],
+            column.get("nullable", True)
+        )
     
     def _format_column_name(self, column_name: str) -> str:
         """
@@ -356,9 +582,9 @@ class ContextEnricher:
         Returns:
             A formatted display name
         """
-        return column_name.replace("_", " ").title()
+        return _format_column_name_cached(column_name)
     
-    def _validate_contextual_data(self, contextual_data: Dict[str, Any]) -> None:
+    def _validate_contextual_data(self, contextual_data: ContextualData) -> None:
         """
         Validate the completeness of the contextual data.
         
@@ -368,17 +594,10 @@ class ContextEnricher:
         Raises:
             ValueError: If the contextual data is incomplete
         """
-        required_fields = ["intent", "context", "filters", "table_metadata", "output_columns"]
-        
-        for field in required_fields:
-            if field not in contextual_data or not contextual_data[field]:
-                raise ValueError(f"Contextual data missing required field: {field}")
+        missing = [field_name for field_name in _REQUIRED_FIELDS if not getattr(contextual_data, field_name)]
+        if missing:
+            raise ValueError(f"Contextual data missing required field: {', '.join(missing)}")
         
-        # Validate table metadata
-        table_meta = contextual_data.get("table_metadata", {})
-        if not table_meta.get("primary_table"):
+        # Validate table metadata (output columns are covered by the required fields)
+        if not contextual_data.table_metadata.primary_table:
             raise ValueError("Table metadata missing primary table")
-        
-        # Validate output columns
-        if not contextual_data.get("output_columns"):
-            raise ValueError("No output columns specified")
\ No newline at end of file
@@ -5,14 +5,77 @@ This module contains the FilterBuilder class which is responsible for
 constructing SQL filter conditions from extracted entities and temporal filters.
 """
 
+import re
 import logging
 import datetime
-from typing import Dict, List, Any, Optional, Union
+from types import MappingProxyType
+from typing import Dict, List, Any, Optional, Union, Mapping, Tuple, Callable
 
 from text2sql.agents.context_agent.schema_mapper import SchemaMapper
+from text2sql.agents.context_agent.models import FilterSpec
 
 logger = logging.getLogger(__name__)
 
+# Map of entity types to default operators
+_OPERATOR_MAP: Mapping[str, str] = MappingProxyType({
+    "status": "=",
+    "priority": "=",
+    "category": "=",
+    "type": "=",
+    "count": ">",
+    "amount": ">",
+    "limit": "<=",
+    "threshold": ">="
+})
+
+# Value prefixes that override the entity type mapping
+_NEGATION_PREFIXES = ("not ", "isn't ", "is not ", "doesn't ", "does not ")
+_GT_PREFIXES = ("greater than", "more than", "over")
+_LT_PREFIXES = ("less than", "under", "below")
+_GTE_PREFIXES = ("at least", "minimum")
+_LTE_PREFIXES = ("at most", "maximum")
+
+_PREFIX_OPERATORS: Tuple[Tuple[Tuple[str, ...], str], ...] = (
+    (_NEGATION_PREFIXES, "!="),
+    (_GT_PREFIXES, ">"),
+    (_LT_PREFIXES, "<"),
+    (_GTE_PREFIXES, ">="),
+    (_LTE_PREFIXES, "<="),
+)
+
+# Operators whose values are cleaned of comparison and negation words
+_COMPARISON_OPERATORS = frozenset(("=", "!=", "<", ">", "<=", ">="))
+
+# Values containing a comparison word anywhere are reduced to their first
+# number ("more than 5", "10 at most"); otherwise a leading negation is removed
+_COMPARISON_WORD_RE = re.compile(r"than|least|most|minimum|maximum", re.IGNORECASE)
+_NUMBER_RE = re.compile(r"\d+")
+_NEGATION_RE = re.compile(r"not |isn't |is not |doesn't |does not ", re.IGNORECASE)
+
+_ONE_DAY = datetime.timedelta(days=1)
+_ONE_WEEK = datetime.timedelta(days=7)
+# Approximate a month as 30 days for simplicity
+_ONE_MONTH = datetime.timedelta(days=30)
+
+# Common temporal expressions resolved relative to today
+_TEMPORAL_DISPATCH: Mapping[str, Callable[[datetime.date], List[str]]] = MappingProxyType({
+    "today": lambda d: [d.isoformat()],
+    "yesterday": lambda d: [(d - _ONE_DAY).isoformat()],
+    "last week": lambda d: [(d - _ONE_WEEK).isoformat(), d.isoformat()],
+    "last month": lambda d: [(d - _ONE_MONTH).isoformat(), d.isoformat()],
+    "this year": lambda d: [datetime.date(d.year, 1, 1).isoformat(), d.isoformat()],
+    "last year": lambda d: [datetime.date(d.year - 1, 1, 1).isoformat(),
+                            datetime.date(d.year - 1, 12, 31).isoformat()],
+})
+
+# Parametric expressions such as "last 3 days" or "last 2 weeks"
+_RELATIVE_RE = re.compile(r"last (\d+) (day|week|month)s?")
+_RELATIVE_UNITS: Mapping[str, datetime.timedelta] = MappingProxyType({
+    "day": _ONE_DAY,
+    "week": _ONE_WEEK,
+    "month": _ONE_MONTH,
+})
+
 class FilterBuilder:
     """
     The FilterBuilder constructs SQL filter conditions from extracted entities and temporal filters.
@@ -29,7 +92,7 @@ class FilterBuilder:
     
     def build_filters(self, entities: List[Dict[str, Any]], 
                      temporal_filter: Optional[Dict[str, Any]],
-                     table_name: str) -> List[Dict[str, Any]]:
+                     table_name: str) -> List[FilterSpec]:
         """
         Build filter specifications from entity extraction and temporal filtering.
         
@@ -39,13 +102,31 @@ class FilterBuilder:
             table_name: The primary table name
             
         Returns:
-            A list of filter dictionaries
+            A list of filter specifications
         """
         filters = []
         
+        # A new query starts a new request for the schema mapper's mapping cache
+        self.schema_mapper.reset_cache()
+        
+        # Map all entities lacking a column in one batched schema mapper call
+        unmapped = [
+            i for i, entity in enumerate(entities)
+            if entity.get("entity_type") and entity.get("entity_value") and not entity.get("mapped_column")
+        ]
+        mappings = self.schema_mapper.map_entities_batch([
+            (entities[i]["entity_type"], entities[i]["entity_value"], table_name) for i in unmapped
+        ]) if unmapped else []
+        resolved = dict(zip(unmapped, mappings))
+        
         # Process entity-based filters
-        for entity in entities:
-            filter_spec = self._build_entity_filter(entity, table_name)
+        for i, entity in enumerate(entities):
+            if i in resolved and resolved[i] is None:
+                # Already reported by the schema mapper
+                continue
+            
+            mapped_column = resolved[i][0] if i in resolved else None
+            filter_spec = self._build_entity_filter(entity, table_name, mapped_column)
             if filter_spec:
                 filters.append(filter_spec)
         
@@ -58,20 +139,22 @@ class FilterBuilder:
         return filters
     
     def _build_entity_filter(self, entity: Dict[str, Any], 
-                            table_name: str) -> Optional[Dict[str, Any]]:
+                            table_name: str,
+                            mapped_column: Optional[str] = None) -> Optional[FilterSpec]:
         """
         Build a filter specification from an entity.
         
         Args:
             entity: The entity extracted from the query
             table_name: The primary table name
+            mapped_column: Column already resolved for the entity, if any
             
         Returns:
-            A filter dictionary or None if the entity can't be mapped
+            A filter specification or None if the entity can't be mapped
         """
         entity_type = entity.get("entity_type", "")
         entity_value = entity.get("entity_value", "")
-        mapped_column = entity.get("mapped_column", "")
+        mapped_column = mapped_column or entity.get("mapped_column", "")
         
         if not entity_type or not entity_value:
             return None
@@ -89,19 +172,19 @@ class FilterBuilder:
             # Process the value based on operator and expected type
             processed_value = self._process_filter_value(entity_value, operator)
             
-            return {
-                "filter_name": entity_type,
-                "column_name": mapped_column,
-                "operator": operator,
-                "value": processed_value
-            }
+            return FilterSpec(
+                filter_name=entity_type,
+                column_name=mapped_column,
+                operator=operator,
+                value=processed_value
+            )
             
         except ValueError as e:
             logger.warning(f"Could not build filter for entity {entity_type}:{entity_value}: {e}")
             return None
     
     def _build_temporal_filter(self, temporal_filter: Dict[str, Any], 
-                              table_name: str) -> Optional[Dict[str, Any]]:
+                              table_name: str) -> Optional[FilterSpec]:
         """
         Build a filter specification from a temporal filter.
         
@@ -110,7 +193,7 @@ class FilterBuilder:
             table_name: The primary table name
             
         Returns:
-            A filter dictionary or None if no date column can be found
+            A filter specification or None if no date column can be found
         """
         if not temporal_filter:
             return None
@@ -139,12 +222,12 @@ class FilterBuilder:
         else:
             operator = ">"  # Default for unspecified temporal filters
         
-        return {
-            "filter_name": "date_range",
-            "column_name": date_column,
-            "operator": operator,
-            "value": values
-        }
+        return FilterSpec(
+            filter_name="date_range",
+            column_name=date_column,
+            operator=operator,
+            value=values
+        )
     
     def _determine_operator(self, entity_type: str, entity_value: Any) -> str:
         """
@@ -157,35 +240,15 @@ class FilterBuilder:
         Returns:
             The SQL operator to use
         """
-        # Map of entity types to default operators
-        operator_map = {
-            "status": "=",
-            "priority": "=",
-            "category": "=",
-            "type": "=",
-            "count": ">",
-            "amount": ">",
-            "limit": "<=",
-            "threshold": ">="
-        }
-        
-        # Check for negation patterns in the value
+        # Check for negation and comparison patterns in the value
         if isinstance(entity_value, str):
-            if entity_value.lower().startswith(("not ", "isn't ", "is not ", "doesn't ", "does not ")):
-                return "!="
-            
-            # Check for comparison indicators
-            if entity_value.lower().startswith(("greater than", "more than", "over")):
-                return ">"
-            if entity_value.lower().startswith(("less than", "under", "below")):
-                return "<"
-            if entity_value.lower().startswith(("at least", "minimum")):
-                return ">="
-            if entity_value.lower().startswith(("at most", "maximum")):
-                return "<="
+            value = entity_value.lower()
+            for prefixes, operator in _PREFIX_OPERATORS:
+                if value.startswith(prefixes):
+                    return operator
         
         # Default to the entity type mapping or equality
-        return operator_map.get(entity_type.lower(), "=")
+        return _OPERATOR_MAP.get(entity_type.lower(), "=")
     
     def _process_filter_value(self, value: Any, operator: str) -> Any:
         """
@@ -199,21 +262,19 @@ class FilterBuilder:
             The processed value
         """
         # Handle equality operators
-        if operator in ["=", "!=", "<", ">", "<=", ">="]:
+        if operator in _COMPARISON_OPERATORS:
             # Clean string values
             if isinstance(value, str):
                 # Extract numeric part if the value contains comparison words
-                if any(word in value.lower() for word in ["than", "least", "most", "minimum", "maximum"]):
-                    # Extract numeric value - simplified example
-                    import re
-                    numbers = re.findall(r'\d+', value)
-                    if numbers:
-                        return int(numbers[0])
+                if _COMPARISON_WORD_RE.search(value):
+                    number = _NUMBER_RE.search(value)
+                    if number:
+                        return int(number.group())
                 
                 # Remove negation words
-                for prefix in ["not ", "isn't ", "is not ", "doesn't ", "does not "]:
-                    if value.lower().startswith(prefix):
-                        return value[len(prefix):].strip()
+                negation = _NEGATION_RE.match(value)
+                if negation:
+                    return value[negation.end():].strip()
                 
                 return value
             
@@ -256,38 +317,21 @@ class FilterBuilder:
             A list of two date strings for a range, or a single date string
         """
         today = datetime.date.today()
+        expr = expression.strip().lower()
         
         # Common temporal expressions
-        if expression.lower() == "today":
-            return [today.isoformat()]
+        resolve = _TEMPORAL_DISPATCH.get(expr)
+        if resolve:
+            return resolve(today)
         
-        if expression.lower() == "yesterday":
-            yesterday = today - datetime.timedelta(days=1)
-            return [yesterday.isoformat()]
-        
-        if expression.lower() == "last week":
-            end_date = today
-            start_date = today - datetime.timedelta(days=7)
-            return [start_date.isoformat(), end_date.isoformat()]
-        
-        if expression.lower() == "last month":
-            end_date = today
-            # Approximate a month as 30 days for simplicity
-            start_date = today - datetime.timedelta(days=30)
-            return [start_date.isoformat(), end_date.isoformat()]
-        
-        if expression.lower() == "this year":
-            start_date = datetime.date(today.year, 1, 1)
+        # Relative expressions like "last N days"
+        match = _RELATIVE_RE.fullmatch(expr)
+        if match:
+            start_date = today - int(match.group(1)) * _RELATIVE_UNITS[match.group(2)]
             return [start_date.isoformat(), today.isoformat()]
         
-        if expression.lower() == "last year":
-            start_date = datetime.date(today.year - 1, 1, 1)
-            end_date = datetime.date(today.year - 1, 12, 31)
-            return [start_date.isoformat(), end_date.isoformat()]
-        
         # Default to recent dates if expression can't be parsed
-        end_date = today
-        start_date = today - datetime.timedelta(days=30)  # Default to last 30 days
+        start_date = today - _ONE_MONTH  # Default to last 30 days
         
         logger.warning(f"Could not precisely resolve temporal expression: {expression}. Using last 30 days.")
-        return [start_date.isoformat(), end_date.isoformat()]
\ No newline at end of file
+        return [start_date.isoformat(), today.isoformat()]
@@ -0,0 +1,98 @@
+"""
+Context Agent - Models
+
+This module contains the lightweight value types produced while enriching a
+decomposed query. They are converted to plain dictionaries only at the
+contextual-data boundary.
+"""
+
+from dataclasses import dataclass, asdict
+from typing import Dict, List, Any, Mapping, NamedTuple
+
+
+@dataclass
+class FilterSpec:
+    """
+    A single SQL filter condition.
+    """
+    __slots__ = ("filter_name", "column_name", "operator", "value")
+
+    filter_name: str
+    column_name: str
+    operator: str
+    value: Any
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to the filter layout used in contextual data."""
+        return asdict(self)
+
+
+@dataclass
+class TableMeta:
+    """
+    Metadata for the primary table of a query.
+    """
+    __slots__ = ("primary_table", "table_description", "table_fields")
+
+    primary_table: str
+    table_description: str
+    table_fields: Mapping[str, str]
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to the table metadata layout used in contextual data."""
+        # table_fields is the MetaStore's read-only view; copy it into a plain dict
+        return {
+            "primary_table": self.primary_table,
+            "table_description": self.table_description,
+            "table_fields": dict(self.table_fields)
+        }
+
+
+class OutputColumn(NamedTuple):
+    """
+    A single output column, kept flat until it is serialized into contextual data.
+    """
+    column_name: str
+    alias: str
+    description: str
+    data_type: str
+    nullable: bool
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to the output column layout used in contextual data."""
+        return {
+            "column_name": self.column_name,
+            "alias": self.alias,
+            "column_description": self.description,
+            "column_fields": {
+                "data_type": self.data_type,
+                "nullable": self.nullable
+            }
+        }
+
+
+@dataclass
+class ContextualData:
+    """
+    The enriched context for one query, handed to the Schema Agent.
+    """
+    __slots__ = ("intent", "context", "short_circuited", "table_metadata",
+                 "filters", "output_columns")
+
+    intent: str
+    context: Dict[str, str]
+    short_circuited: bool
+    table_metadata: TableMeta
+    filters: List[FilterSpec]
+    output_columns: List[OutputColumn]
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to the contextual data JSON layout."""
+        return {
+            "intent": self.intent,
+            "context": self.context,
+            "short_circuited": self.short_circuited,
+            "table_metadata": self.table_metadata.to_dict(),
+            "filters": [filter_spec.to_dict() for filter_spec in self.filters],
+            "output_columns": [column.to_dict() for column in self.output_columns]
+        }
@@ -5,14 +5,58 @@ This module contains the SchemaMapper class which is responsible for
 mapping natural language entities to database schema elements using vector similarity.
 """
 
+import re
 import logging
-from typing import Dict, List, Any, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Any, Optional, Tuple, Callable, Mapping
 
 # Assuming this will be created in the project
 from text2sql.metastore.metastore import MetaStore
 
 logger = logging.getLogger(__name__)
 
+# Table heads and SQL pairs are searched concurrently when column metadata alone
+# does not give a confident match
+_SEARCH_WORKERS = 3
+
+# Score above which a column metadata match is used without consulting
+# table heads or SQL pairs
+_COLUMN_MATCH_THRESHOLD = 0.7
+
+# Shared by every SchemaMapper so constructing mappers does not leave idle threads
+# behind; worker threads are only started once searches are submitted
+_SEARCH_EXECUTOR = ThreadPoolExecutor(max_workers=_SEARCH_WORKERS, thread_name_prefix="schema-search")
+
+# Map of common entity types to likely column name patterns
+_PATTERN_MAP = {
+    "status": ["status", "state"],
+    "priority": ["priority", "importance", "urgency"],
+    "category": ["category", "type", "class"],
+    "date": ["date", "time", "created", "updated"],
+    "id": ["id", "identifier", "key"],
+    "name": ["name", "title"],
+    "description": ["description", "details", "text"]
+}
+
+# Entity types whose patterns are a prefix of each pattern: the longest pattern
+# found at a position also accounts for the shorter ones starting there
+_PATTERN_OWNERS = {
+    pattern: frozenset(
+        entity_type
+        for entity_type, patterns in _PATTERN_MAP.items()
+        for prefix in patterns
+        if pattern.startswith(prefix)
+    )
+    for patterns in _PATTERN_MAP.values()
+    for pattern in patterns
+}
+
+# Every pattern in one automaton; the lookahead reports overlapping matches so a
+# column name is scanned once for all entity types
+_ANY_PATTERN_RE = re.compile(
+    "(?=(" + "|".join(re.escape(pattern) for pattern in sorted(_PATTERN_OWNERS, key=len, reverse=True)) + "))"
+)
+
 class SchemaMapper:
     """
     The SchemaMapper maps natural language entities to database schema elements
@@ -27,6 +71,32 @@ class SchemaMapper:
             metastore: An instance of MetaStore for retrieving database metadata
         """
         self.metastore = metastore
+        # Per table: the metadata it was built from, and lowercased entity
+        # type -> first column matching its patterns
+        self._heuristic_index: Dict[str, Tuple[Mapping[str, Any], Dict[str, Optional[str]]]] = {}
+        # Mappings resolved during the current request, see reset_cache()
+        self._request_cache: Dict[Tuple[str, str, str], Tuple[str, float]] = {}
+    
+    def reset_cache(self) -> None:
+        """
+        Forget the entity mappings resolved so far; call at the start of each request.
+        """
+        self._request_cache.clear()
+    
+    def invalidate(self, table_name: Optional[str] = None) -> None:
+        """
+        Drop precomputed heuristic matches for a table.
+        
+        Not needed after a MetaStore reindex: matches are rebuilt whenever the
+        MetaStore returns new metadata for the table.
+        
+        Args:
+            table_name: The table whose schema changed, or None to clear every table
+        """
+        if table_name is None:
+            self._heuristic_index.clear()
+        else:
+            self._heuristic_index.pop(table_name, None)
     
     def map_entity_to_column(self, entity_type: str, entity_value: str, 
                             table_name: str) -> Tuple[str, float]:
@@ -41,20 +111,145 @@ class SchemaMapper:
         Returns:
             A tuple containing the column name and confidence score
         """
+        cache_key = (entity_type, entity_value, table_name)
+        cached = self._request_cache.get(cache_key)
+        if cached is not None:
+            return cached
+        
         logger.info(f"Mapping entity {entity_type}:{entity_value} to a column in {table_name}")
         
-        # Step 1: Try direct mapping from column metadata
+        # Step 1: a confident column metadata match needs no fallback searches
         column_match = self._search_column_metadata(entity_type, entity_value, table_name)
-        if column_match and column_match[1] > 0.7:  # High confidence threshold
+        if column_match and column_match[1] > _COLUMN_MATCH_THRESHOLD:
+            self._request_cache[cache_key] = column_match
+            return column_match
+        
+        # Steps 2 and 3 are independent searches: start them together and
+        # consume the results in priority order
+        sample_future = _SEARCH_EXECUTOR.submit(self._search_table_heads, entity_value, table_name)
+        sql_pair_future = _SEARCH_EXECUTOR.submit(
+            self._search_sql_pairs, entity_type, entity_value, table_name
+        )
+        
+        try:
+            mapping = self._resolve_mapping(
+                entity_type, entity_value, table_name, column_match,
+                sample_search=sample_future.result,
+                sql_pair_search=sql_pair_future.result
+            )
+            self._request_cache[cache_key] = mapping
+            return mapping
+        finally:
+            # Skip the SQL pairs search if it has not started once the mapping is decided
+            sql_pair_future.cancel()
+    
+    def map_entities_batch(self, entities: List[Tuple[str, str, str]]) -> List[Optional[Tuple[str, float]]]:
+        """
+        Map several entities to database columns, batching the column metadata
+        searches into one MetaStore call per table. Repeated entities and
+        entities already mapped in the current request are not searched again.
+        
+        Args:
+            entities: (entity_type, entity_value, table_name) tuples to map
+            
+        Returns:
+            A (column_name, confidence_score) tuple per entity in input order,
+            or None where the entity could not be mapped
+        """
+        # Only entities not already resolved in this request are mapped, each once
+        pending = [
+            entity for entity in dict.fromkeys(entities)
+            if entity not in self._request_cache
+        ]
+        resolved: Dict[Tuple[str, str, str], Optional[Tuple[str, float]]] = {
+            entity: self._request_cache.get(entity) for entity in entities
+        }
+        
+        if pending:
+            logger.info(f"Mapping {len(pending)} entities to columns")
+            for entity, mapping in zip(pending, self._map_uncached_entities(pending)):
+                resolved[entity] = mapping
+                if mapping is not None:
+                    self._request_cache[entity] = mapping
+        
+        return [resolved[entity] for entity in entities]
+    
+    def _map_uncached_entities(self, entities: List[Tuple[str, str, str]]) -> List[Optional[Tuple[str, float]]]:
+        """
+        Map distinct entities to columns, batching the column metadata searches
+        into one MetaStore call per table.
+        
+        Args:
+            entities: Distinct (entity_type, entity_value, table_name) tuples to map
+            
+        Returns:
+            A (column_name, confidence_score) tuple per entity in input order,
+            or None where the entity could not be mapped
+        """
+        # Group entities by table so each table gets a single filtered search
+        by_table: Dict[str, List[int]] = {}
+        for i, (_, _, table_name) in enumerate(entities):
+            by_table.setdefault(table_name, []).append(i)
+        
+        # Step 1 for every entity: direct mapping from column metadata
+        column_matches: List[Optional[Tuple[str, float]]] = [None] * len(entities)
+        for table_name, indices in by_table.items():
+            queries = [self._build_query(entities[i][0], entities[i][1]) for i in indices]
+            results = self.metastore.search_schema_batch(
+                queries, k=3, filter={"table": table_name}
+            )
+            for i, columns in zip(indices, results):
+                column_matches[i] = self._top_column(columns)
+        
+        # Steps 2-5 per entity, only reached when step 1 is not confident enough
+        mappings: List[Optional[Tuple[str, float]]] = []
+        for (entity_type, entity_value, table_name), column_match in zip(entities, column_matches):
+            try:
+                mappings.append(
+                    self._resolve_mapping(entity_type, entity_value, table_name, column_match)
+                )
+            except ValueError as e:
+                logger.warning(str(e))
+                mappings.append(None)
+        
+        return mappings
+    
+    def _resolve_mapping(self, entity_type: str, entity_value: str, table_name: str,
+                         column_match: Optional[Tuple[str, float]],
+                         sample_search: Optional[Callable[[], Optional[Tuple[str, float]]]] = None,
+                         sql_pair_search: Optional[Callable[[], Optional[Tuple[str, float]]]] = None
+                         ) -> Tuple[str, float]:
+        """
+        Decide on a column mapping given the column metadata match, falling back
+        to table heads, SQL pairs and name heuristics.
+        
+        Args:
+            entity_type: The type of entity
+            entity_value: The value of the entity
+            table_name: The target table name
+            column_match: The result of the column metadata search, if any
+            sample_search: Returns the table heads match; searched on demand if omitted
+            sql_pair_search: Returns the SQL pairs match; searched on demand if omitted
+            
+        Returns:
+            A tuple containing the column name and confidence score
+        """
+        if column_match and column_match[1] > _COLUMN_MATCH_THRESHOLD:
             return column_match
         
         # Step 2: Try using sample data (table heads)
-        sample_match = self._search_table_heads(entity_value, table_name)
+        if sample_search is not None:
+            sample_match = sample_search()
+        else:
+            sample_match = self._search_table_heads(entity_value, table_name)
         if sample_match and sample_match[1] > 0.8:  # Higher threshold for exact value matches
             return sample_match
         
         # Step 3: Try using similar SQL pairs
-        sql_pair_match = self._search_sql_pairs(entity_type, entity_value, table_name)
+        if sql_pair_search is not None:
+            sql_pair_match = sql_pair_search()
+        else:
+            sql_pair_match = self._search_sql_pairs(entity_type, entity_value, table_name)
         if sql_pair_match:
             return sql_pair_match
         
@@ -70,6 +265,36 @@ class SchemaMapper:
         # If all attempts fail, raise an exception
         raise ValueError(f"Could not map entity {entity_type}:{entity_value} to a column in {table_name}")
     
+    def _build_query(self, entity_type: str, entity_value: str) -> str:
+        """
+        Build the column metadata search query for an entity.
+        
+        Args:
+            entity_type: The type of entity
+            entity_value: The value of the entity
+            
+        Returns:
+            The search query
+        """
+        # Create a rich query combining entity type and value
+        return f"{entity_type} {entity_value}"
+    
+    def _top_column(self, columns: List[Dict[str, Any]]) -> Optional[Tuple[str, float]]:
+        """
+        Pick the highest scoring column from column metadata search results.
+        
+        Args:
+            columns: Search results from the MetaStore
+            
+        Returns:
+            A tuple of (column_name, confidence_score) if any, None otherwise
+        """
+        if columns:
+            # Return the highest scoring column with its confidence score
+            return columns[0]["name"], columns[0].get("score", 0.0)
+        
+        return None
+    
     def _search_column_metadata(self, entity_type: str, entity_value: str, 
                                table_name: str) -> Optional[Tuple[str, float]]:
         """
@@ -83,21 +308,16 @@ class SchemaMapper:
         Returns:
             A tuple of (column_name, confidence_score) if found, None otherwise
         """
-        # Create a rich query combining entity type and value
-        query = f"{entity_type} {entity_value}"
+        query = self._build_query(entity_type, entity_value)
         
         # Search in column metadata with table filter
         columns = self.metastore.search_schema(
             query, 
-            filter={"table": table_name}, 
-            top_k=3
+            k=3,
+            filter={"table": table_name}
         )
         
-        if columns and len(columns) > 0:
-            # Return the highest scoring column with its confidence score
-            return columns[0]["name"], columns[0].get("score", 0.0)
-        
-        return None
+        return self._top_column(columns)
     
     def _search_table_heads(self, entity_value: str, 
                            table_name: str) -> Optional[Tuple[str, float]]:
@@ -170,36 +390,56 @@ class SchemaMapper:
         Returns:
             A tuple of (column_name, confidence_score) if found, None otherwise
         """
-        # Get all columns for the table
+        entity_type = entity_type.lower()
         table_metadata = self.metastore.get_table_metadata(table_name)
         
         if not table_metadata:
             return None
         
-        # Map of common entity types to likely column name patterns
-        pattern_map = {
-            "status": ["status", "state"],
-            "priority": ["priority", "importance", "urgency"],
-            "category": ["category", "type", "class"],
-            "date": ["date", "time", "created", "updated"],
-            "id": ["id", "identifier", "key"],
-            "name": ["name", "title"],
-            "description": ["description", "details", "text"]
-        }
+        # The MetaStore memoizes metadata until the schema is reindexed, so a
+        # different object means the matches are stale
+        cached = self._heuristic_index.get(table_name)
+        if cached is not None and cached[0] is table_metadata:
+            table_index = cached[1]
+        else:
+            table_index = self._build_heuristic_index(table_metadata.get("columns", []))
+            self._heuristic_index[table_name] = (table_metadata, table_index)
+        
+        if entity_type not in table_index:
+            # Entity types without known patterns are matched on their own name
+            table_index[entity_type] = next(
+                (column["name"] for column in table_metadata.get("columns", [])
+                 if entity_type in column["_lc_name"]),
+                None
+            )
+        
+        column_name = table_index[entity_type]
+        if column_name is None:
+            return None
         
-        # Get patterns for this entity type
-        patterns = pattern_map.get(entity_type.lower(), [entity_type.lower()])
+        # Return with a lower confidence score since this is heuristic
+        return column_name, 0.6
+    
+    def _build_heuristic_index(self, columns: List[Dict[str, Any]]) -> Dict[str, Optional[str]]:
+        """
+        Match every known entity type against a table's columns in one scan per column.
         
-        # Look for columns matching the patterns
-        for column in table_metadata.get("columns", []):
-            column_name = column.get("name", "").lower()
+        Args:
+            columns: Column metadata of the table, in schema order
             
-            for pattern in patterns:
-                if pattern in column_name:
-                    # Return with a lower confidence score since this is heuristic
-                    return column["name"], 0.6
+        Returns:
+            A dictionary mapping each entity type in the pattern map to the
+            first column whose name contains one of its patterns, or None
+        """
+        table_index: Dict[str, Optional[str]] = dict.fromkeys(_PATTERN_MAP)
         
-        return None
+        for column in columns:
+            for match in _ANY_PATTERN_RE.finditer(column["_lc_name"]):
+                for entity_type in _PATTERN_OWNERS[match.group(1)]:
+                    if table_index[entity_type] is None:
+                        table_index[entity_type] = column["name"]
+        
+        return table_index
     
     def find_date_column(self, table_name: str) -> Optional[str]:
         """
@@ -211,26 +451,8 @@ class SchemaMapper:
         Returns:
             The name of the date column, or None if not found
         """
-        # Get the table metadata
-        table_metadata = self.metastore.get_table_metadata(table_name)
-        
-        if not table_metadata:
-            return None
-        
-        # Look for date/time columns based on data type
-        for column in table_metadata.get("columns", []):
-            data_type = column.get("data_type", "").upper()
-            if any(dt in data_type for dt in ["DATE", "TIME", "TIMESTAMP"]):
-                return column["name"]
-        
-        # If no date types found, look for columns with date-related names
-        date_patterns = ["date", "time", "created", "updated", "timestamp"]
-        for column in table_metadata.get("columns", []):
-            column_name = column.get("name", "").lower()
-            if any(pattern in column_name for pattern in date_patterns):
-                return column["name"]
-        
-        return None
+        # Precomputed by the MetaStore when the schema is indexed
+        return self.metastore.get_date_column(table_name)
     
     def get_relevant_columns(self, table_name: str, expected_output: str) -> List[Dict[str, Any]]:
         """
@@ -252,29 +474,15 @@ class SchemaMapper:
         # Use vector search to find relevant columns
         relevant_columns = self.metastore.search_schema(
             expected_output,
-            filter={"table": table_name},
-            top_k=10
+            k=10,
+            filter={"table": table_name}
         )
         
         # If specific columns are found, return them
         if relevant_columns:
             return relevant_columns
         
-        # Otherwise, return all columns with reasonable defaults
-        # Include key columns and common display columns like name, title, etc.
-        key_columns = []
-        display_columns = []
-        
-        for column in table_metadata.get("columns", []):
-            column_name = column.get("name", "").lower()
-            
-            # Identify key columns (IDs)
-            if column.get("is_primary_key", False) or "id" in column_name:
-                key_columns.append(column)
-            
-            # Identify display columns
-            if any(pattern in column_name for pattern in ["name", "title", "description", "status"]):
-                display_columns.append(column)
-        
-        # Return key columns first, then display columns
-        return key_columns + display_columns
\ No newline at end of file
+        # Otherwise, return all columns with reasonable defaults:
+        # key columns first, then display columns like name, title, etc.
+        columns_by_role = table_metadata["columns_by_role"]
+        return list(columns_by_role["key"]) + list(columns_by_role["display"])
\ No newline at end of file
@@ -0,0 +1,170 @@
+"""
+Context Agent - Semantic Search Cache
+
+This module contains the SemanticSearchCache class which memoizes MetaStore
+schema searches so that repeated or near-duplicate questions skip the vector search.
+"""
+
+import time
+import logging
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Any, Optional, Callable, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+CacheKey = Tuple[str, int, Optional[Tuple[Tuple[str, Any], ...]]]
+
+# Query embeddings kept so a get() miss and the following put() embed once
+_RECENT_EMBEDDINGS = 256
+
+
+class SemanticSearchCache:
+    """
+    An in-memory LRU cache for schema search results with exact and
+    embedding-similarity lookup.
+
+    Entries are not tied to the MetaStore's index: call invalidate() (or
+    ContextEnricher.invalidate()) after MetaStore.index_schema_data, otherwise
+    only ttl_seconds limits how long results from the old index are served.
+    """
+
+    def __init__(self, embed_fn: Optional[Callable[[str], np.ndarray]] = None,
+                 max_entries: int = 1024, ttl_seconds: float = 300.0,
+                 similarity_threshold: float = 0.95):
+        """
+        Initialize the SemanticSearchCache.
+
+        Args:
+            embed_fn: Function returning the embedding vector for a query string;
+                ContextEnricher defaults it to the MetaStore's query embedding,
+                which shares the MetaStore's embedding cache
+            max_entries: Maximum number of cached searches before evicting the oldest
+            ttl_seconds: How long a cached search stays valid
+            similarity_threshold: Minimum cosine similarity for a near-duplicate hit
+        """
+        self.embed_fn = embed_fn
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.similarity_threshold = similarity_threshold
+        self._entries: "OrderedDict[CacheKey, Tuple[np.ndarray, List[Dict[str, Any]], float]]" = OrderedDict()
+        self._recent_embeddings: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        # Lookups may come from executor threads when enrichment runs asynchronously;
+        # the lock is never held while embedding
+        self._lock = threading.RLock()
+
+    @staticmethod
+    def _make_key(query: str, top_k: int, filter: Optional[Dict[str, Any]]) -> CacheKey:
+        """Build a hashable cache key from the search arguments."""
+        filter_key = tuple(sorted(filter.items())) if filter else None
+        return query, top_k, filter_key
+
+    def _embed(self, query: str, embedding: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        L2-normalize a query embedding so dot products are cosine similarities,
+        computing it with embed_fn unless it was given or embedded recently.
+        """
+        if embedding is None:
+            with self._lock:
+                embedding = self._recent_embeddings.get(query)
+            if embedding is not None:
+                return embedding
+            embedding = self.embed_fn(query)
+
+        embedding = np.asarray(embedding, dtype=np.float32)
+        norm = np.linalg.norm(embedding)
+        embedding = embedding / norm if norm else embedding
+
+        with self._lock:
+            self._recent_embeddings[query] = embedding
+            self._recent_embeddings.move_to_end(query)
+            while len(self._recent_embeddings) > _RECENT_EMBEDDINGS:
+                self._recent_embeddings.popitem(last=False)
+        return embedding
+
+    def get(self, query: str, top_k: int, filter: Optional[Dict[str, Any]] = None,
+            embedding: Optional[np.ndarray] = None) -> Optional[List[Dict[str, Any]]]:
+        """
+        Look up cached results for a search.
+
+        Args:
+            query: The search query
+            top_k: Number of results requested
+            filter: Optional metadata filter passed to the search
+            embedding: The query's embedding, if already computed
+
+        Returns:
+            The cached results, or None on a cache miss
+        """
+        key = self._make_key(query, top_k, filter)
+
+        with self._lock:
+            now = time.monotonic()
+
+            # Exact match
+            entry = self._entries.get(key)
+            if entry is not None:
+                if now - entry[2] <= self.ttl_seconds:
+                    self._entries.move_to_end(key)
+                    return entry[1]
+                del self._entries[key]
+
+            # Near-duplicate candidates: live searches with the same top_k and filter
+            candidates = []
+            for cached_key, (cached_embedding, _, created) in list(self._entries.items()):
+                if now - created > self.ttl_seconds:
+                    del self._entries[cached_key]
+                elif cached_key[1:] == key[1:]:
+                    candidates.append((cached_key, cached_embedding))
+
+        if not candidates:
+            return None
+
+        query_embedding = self._embed(query, embedding)
+        best_key, best_score = None, self.similarity_threshold
+        for cached_key, cached_embedding in candidates:
+            score = float(np.dot(query_embedding, cached_embedding))
+            if score >= best_score:
+                best_key, best_score = cached_key, score
+
+        if best_key is None:
+            return None
+
+        with self._lock:
+            # Evicted by another thread while comparing
+            entry = self._entries.get(best_key)
+            if entry is None:
+                return None
+            logger.debug(f"Semantic cache hit for '{query}' (similarity {best_score:.3f})")
+            self._entries.move_to_end(best_key)
+            return entry[1]
+
+    def put(self, query: str, top_k: int, filter: Optional[Dict[str, Any]],
+            results: List[Dict[str, Any]], embedding: Optional[np.ndarray] = None) -> None:
+        """
+        Store the results of a search.
+
+        Args:
+            query: The search query
+            top_k: Number of results requested
+            filter: Optional metadata filter passed to the search
+            results: The results returned by the MetaStore
+            embedding: The query's embedding, if already computed
+        """
+        key = self._make_key(query, top_k, filter)
+        query_embedding = self._embed(query, embedding)
+
+        with self._lock:
+            self._entries[key] = (query_embedding, results, time.monotonic())
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self) -> None:
+        """Drop every cached search, e.g. after the schema index is rebuilt."""
+        with self._lock:
+            self._entries.clear()
+            self._recent_embeddings.clear()
@@ -5,14 +5,21 @@ This module extracts schema information from a PostgreSQL database
 and prepares it for use in the MetaStore vector search system.
 """
 
+import io
 import os
-import json
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-import pandas as pd
 from typing import Dict, Any, Optional, List
+import orjson
+import pyarrow.csv as pa_csv
+import pyarrow.feather as feather
 from loguru import logger
 
 from utils.db_connection import DatabaseConnection
+from metastore.schema_format import DATE_TYPE_RE, DATE_NAME_RE, SCHEMA_PACK_FILE
+
+# Sample extraction is bound by database round-trips, so tables are copied concurrently
+SAMPLE_WORKERS = 8
 
 
 def extract_schema(db_connection: DatabaseConnection, output_dir: str):
@@ -37,10 +44,11 @@ def extract_schema(db_connection: DatabaseConnection, output_dir: str):
         schema_info = db_connection.get_schema_info()
         
         # Save the complete schema information
-        with open(os.path.join(output_dir, "complete_schema.json"), "w") as f:
-            json.dump(schema_info, f, indent=2, default=str)
+        with open(os.path.join(output_dir, "complete_schema.json"), "wb") as f:
+            f.write(orjson.dumps(schema_info, option=orjson.OPT_INDENT_2, default=str))
         
         # Create individual table schema files for better search granularity
+        table_schemas = {}
         for table_name, table_info in schema_info.items():
             table_schema = {
                 "table_name": table_name,
@@ -51,11 +59,14 @@ def extract_schema(db_connection: DatabaseConnection, output_dir: str):
             
             # Process columns
             for col in table_info["columns"]:
+                column_type = str(col["type"])
                 column_data = {
                     "name": col["name"],
-                    "type": str(col["type"]),
+                    "type": column_type,
                     "nullable": col.get("nullable", True),
-                    "default": str(col.get("default", ""))
+                    "default": str(col.get("default", "")),
+                    # Flag date-like columns once here instead of at query time
+                    "is_date": bool(DATE_TYPE_RE.search(column_type) or DATE_NAME_RE.search(col["name"]))
                 }
                 table_schema["columns"].append(column_data)
             
@@ -69,8 +80,13 @@ def extract_schema(db_connection: DatabaseConnection, output_dir: str):
                 table_schema["foreign_keys"].append(fk_data)
             
             # Save individual table schema
-            with open(os.path.join(output_dir, f"{table_name}_schema.json"), "w") as f:
-                json.dump(table_schema, f, indent=2)
+            with open(os.path.join(output_dir, f"{table_name}_schema.json"), "wb") as f:
+                f.write(orjson.dumps(table_schema, option=orjson.OPT_INDENT_2))
+            table_schemas[table_name] = table_schema
+        
+        # Save every table schema together so loading is one open and one parse
+        with open(os.path.join(output_dir, SCHEMA_PACK_FILE), "wb") as f:
+            f.write(orjson.dumps(table_schemas))
         
         logger.info(f"Successfully extracted schema for {len(schema_info)} tables")
         return True
@@ -100,22 +116,34 @@ def extract_table_samples(db_connection: DatabaseConnection, output_dir: str,
     # Create output directory if it doesn't exist
     Path(output_dir).mkdir(parents=True, exist_ok=True)
     
+    def copy_samples(table_name: str) -> bool:
+        query = f"SELECT * FROM {table_name} LIMIT {sample_size}"
+        buffer = io.BytesIO()
+        if not db_connection.copy_query_to_csv(query, buffer):
+            return False
+        
+        # A failure on one table is logged and must not stop the other workers
+        try:
+            # Store as uncompressed Arrow IPC so the MetaStore can memory-map it
+            buffer.seek(0)
+            feather.write_feather(
+                pa_csv.read_csv(buffer),
+                os.path.join(output_dir, f"{table_name}_samples.arrow"),
+                compression="uncompressed"
+            )
+            return True
+        except Exception as e:
+            logger.error(f"Error extracting samples for table {table_name}: {str(e)}")
+            return False
+    
     try:
         tables = db_connection.get_tables()
         
-        for table_name in tables:
-            query = f"SELECT * FROM {table_name} LIMIT {sample_size}"
-            success, results = db_connection.execute_query(query)
-            
-            if success and "rows" in results:
-                # Convert to pandas DataFrame for easier manipulation
-                df = pd.DataFrame(results["rows"], columns=results["columns"])
-                
-                # Save as JSON and CSV for flexibility
-                df.to_json(os.path.join(output_dir, f"{table_name}_samples.json"), orient="records", indent=2)
-                df.to_csv(os.path.join(output_dir, f"{table_name}_samples.csv"), index=False)
+        # Let the server serialize the samples, then convert each to Arrow
+        with ThreadPoolExecutor(max_workers=SAMPLE_WORKERS) as executor:
+            copied = sum(executor.map(copy_samples, tables))
         
-        logger.info(f"Successfully extracted samples for {len(tables)} tables")
+        logger.info(f"Successfully extracted samples for {copied} of {len(tables)} tables")
         return True
         
     except Exception as e:
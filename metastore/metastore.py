@@ -6,14 +6,240 @@ sample data, and vector embeddings used in the natural language to SQL conversio
 """
 
 import os
-import json
+import re
+import csv
+import functools
+import threading
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+from collections import OrderedDict
+from types import MappingProxyType
 import faiss
+import torch
 import numpy as np
+import orjson
+import pyarrow.feather as feather
 from pathlib import Path
-from typing import Dict, List, Any, Optional, Tuple
-from sentence_transformers import SentenceTransformer
+from typing import Dict, List, Any, Optional, Tuple, Mapping
+from sentence_transformers import SentenceTransformer, models as st_models
 from loguru import logger
 
+from .schema_format import DATE_TYPE_RE, DATE_NAME_RE, SCHEMA_PACK_FILE
+
+# Column names that make a good default output column
+_DISPLAY_NAME_RE = re.compile(r"name|title|description|status")
+
+# Threads reading individual schema files when no schema pack exists
+SCHEMA_READ_WORKERS = 32
+
+# Search filter keys that are stored under a different metadata field
+_FILTER_FIELDS = {
+    "table": "table_name"
+}
+
+# Scalar quantizers available for compressing the schema index
+_SCALAR_QUANTIZERS = {
+    "fp16": faiss.ScalarQuantizer.QT_fp16,
+    "int8": faiss.ScalarQuantizer.QT_8bit
+}
+
+# Supported layouts for the schema index
+_INDEX_TYPES = ("flat", "hnsw", "ivfpq")
+
+# HNSW graph parameters: links per node, build-time and minimum search-time beam
+# width, and search-time beam width per requested neighbour
+HNSW_M = 32
+HNSW_EF_CONSTRUCTION = 200
+HNSW_EF_SEARCH = 100
+HNSW_EF_SEARCH_PER_K = 4
+
+# IVFPQ parameters: minimum entries to train on (smaller corpora stay flat),
+# subquantizers, bits per code and inverted lists probed per query
+IVFPQ_MIN_ENTRIES = 10_000
+IVFPQ_M = 16
+IVFPQ_NBITS = 8
+IVFPQ_NPROBE = 8
+
+# Query batch size from which faiss flat search switches from per-vector SIMD
+# distance loops to a single BLAS sgemm against the stored vectors; applies to
+# FP32 flat indices and filtered faiss.knn searches, scalar-quantized indices
+# always use the SIMD scan
+BLAS_BATCH_THRESHOLD = 10
+
+# OpenMP threads faiss uses for searches; single queries are faster without
+# the fork/join overhead, bulk indexing temporarily uses every core
+SEARCH_OMP_THREADS = 1
+
+# Texts per forward pass when embedding schema entries for indexing
+EMBEDDING_BATCH_SIZE = 64
+
+# Number of query embeddings kept in the per-store LRU cache
+QUERY_EMBEDDING_CACHE_SIZE = 4096
+
+# Number of filters whose reconstructed FP32 vectors are kept for filtered
+# searches; bounded so a quantized index is not rebuilt in FP32 over time
+FILTERED_VECTORS_CACHE_SIZE = 32
+
+# Candidates per requested result that a quantized index shortlists for exact FP32 reranking
+RERANK_K_FACTOR = 4
+
+# Minimum recall@k against the FP32 index for a quantized index to be kept
+MIN_QUANTIZED_RECALL = 0.98
+
+# Minimum entries before unfiltered searches run on a GPU copy of the schema
+# index; below this the host-device transfer outweighs the faster kernel
+GPU_MIN_ENTRIES = 50_000
+
+
+@contextmanager
+def _faiss_threads(num_threads: int):
+    """
+    Temporarily change the number of OpenMP threads faiss uses.
+    
+    Args:
+        num_threads: Thread count to use inside the block
+    """
+    previous = faiss.omp_get_max_threads()
+    faiss.omp_set_num_threads(num_threads)
+    try:
+        yield
+    finally:
+        faiss.omp_set_num_threads(previous)
+
+
+@functools.lru_cache(maxsize=4)
+def _get_embedding_model(model_name: str) -> SentenceTransformer:
+    """
+    Load a SentenceTransformer model once per process.
+    
+    Args:
+        model_name: Name or path of the model
+        
+    Returns:
+        The shared model instance, in FP16 when running on a GPU
+    """
+    logger.info(f"Loading embedding model {model_name}")
+    model = SentenceTransformer(model_name)
+    
+    # Half precision doubles GPU encode throughput; CPUs stay on FP32
+    if torch.cuda.is_available():
+        model = model.half()
+    return model
+
+
+class _OnnxSentenceEncoder:
+    """
+    ONNX Runtime replacement for SentenceTransformer.encode.
+    
+    The model's transformer is exported to ONNX once; token embeddings are
+    mean-pooled (and normalized, if the model does so) like the original pipeline.
+    Only Transformer -> mean Pooling -> optional Normalize models are accepted,
+    since any other module would make the embeddings differ from PyTorch's.
+    """
+    
+    def __init__(self, model: SentenceTransformer, onnx_path: str):
+        """
+        Export the model if needed and open an inference session.
+        
+        Args:
+            model: The loaded SentenceTransformer (FP32, on CPU)
+            onnx_path: Where the exported transformer is stored
+            
+        Raises:
+            ValueError: If the model's modules are not in the supported layout
+        """
+        modules = list(model)
+        if not self._is_supported(modules):
+            layout = " -> ".join(type(module).__name__ for module in modules)
+            raise ValueError(f"Only Transformer -> mean Pooling -> [Normalize] models can be "
+                             f"run with ONNX Runtime, got {layout}")
+        
+        import onnxruntime as ort
+        
+        self.tokenizer = model.tokenizer
+        self.max_seq_length = model.max_seq_length
+        self.dimension = model.get_sentence_embedding_dimension()
+        self.normalize = len(modules) == 3
+        
+        if not os.path.exists(onnx_path):
+            self._export(modules[0].auto_model, onnx_path)
+        
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        self.session = ort.InferenceSession(
+            onnx_path, sess_options=options, providers=['CPUExecutionProvider']
+        )
+        self.input_names = [model_input.name for model_input in self.session.get_inputs()]
+    
+    @staticmethod
+    def _is_supported(modules: List[torch.nn.Module]) -> bool:
+        """Check for exactly Transformer -> mean Pooling -> optional Normalize."""
+        return (
+            len(modules) in (2, 3)
+            and isinstance(modules[0], st_models.Transformer)
+            and isinstance(modules[1], st_models.Pooling)
+            and modules[1].get_pooling_mode_str() == 'mean'
+            and (len(modules) == 2 or isinstance(modules[2], st_models.Normalize))
+        )
+    
+    def _export(self, transformer: torch.nn.Module, onnx_path: str):
+        """Export a Hugging Face transformer with dynamic batch and sequence axes."""
+        dummy = self.tokenizer(["schema search"], return_tensors='pt')
+        # Positional order of BERT-style forward() arguments
+        input_names = [name for name in ('input_ids', 'attention_mask', 'token_type_ids') if name in dummy]
+        dynamic_axes = {name: {0: 'batch', 1: 'sequence'} for name in input_names + ['last_hidden_state']}
+        
+        transformer.eval()
+        with torch.no_grad():
+            torch.onnx.export(
+                transformer,
+                tuple(dummy[name] for name in input_names),
+                onnx_path,
+                input_names=input_names,
+                output_names=['last_hidden_state'],
+                dynamic_axes=dynamic_axes,
+                opset_version=14
+            )
+        logger.info(f"Exported embedding model to {onnx_path}")
+    
+    def get_sentence_embedding_dimension(self) -> int:
+        """Return the embedding dimension of the wrapped model."""
+        return self.dimension
+    
+    def encode(self, sentences: List[str], batch_size: int = 32,
+               normalize_embeddings: bool = False, **kwargs) -> np.ndarray:
+        """
+        Embed sentences with the ONNX model.
+        
+        Args:
+            sentences: Texts to embed
+            batch_size: Texts per inference call
+            normalize_embeddings: L2-normalize the embeddings
+            **kwargs: Other SentenceTransformer.encode options, ignored
+            
+        Returns:
+            A (len(sentences), dimension) float32 matrix
+        """
+        # Batch texts of similar length together to keep padding small
+        order = np.argsort([-len(sentence) for sentence in sentences], kind='stable')
+        embeddings = np.empty((len(sentences), self.dimension), dtype=np.float32)
+        
+        for start in range(0, len(sentences), batch_size):
+            batch = order[start:start + batch_size]
+            features = self.tokenizer(
+                [sentences[i] for i in batch], padding=True, truncation=True,
+                max_length=self.max_seq_length, return_tensors='np'
+            )
+            inputs = {name: features[name].astype(np.int64) for name in self.input_names}
+            token_embeddings = self.session.run(['last_hidden_state'], inputs)[0]
+            
+            mask = features['attention_mask'][..., None].astype(np.float32)
+            embeddings[batch] = (token_embeddings * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+        
+        if normalize_embeddings or self.normalize:
+            embeddings /= np.clip(np.linalg.norm(embeddings, axis=1, keepdims=True), 1e-12, None)
+        return embeddings
+
 
 class MetaStore:
     """
@@ -23,7 +249,12 @@ class MetaStore:
     
     def __init__(self, vector_db_path: str, schema_dir: str, 
                  table_heads_dir: str, sql_pairs_dir: str,
-                 embedding_model: str = "all-MiniLM-L6-v2"):
+                 embedding_model: str = "all-MiniLM-L6-v2",
+                 default_table: Optional[str] = None,
+                 quantization: Optional[str] = "auto",
+                 index_type: str = "flat",
+                 rerank: bool = False,
+                 use_onnx: bool = False):
         """
         Initialize the MetaStore.
         
@@ -33,28 +264,94 @@ class MetaStore:
             table_heads_dir: Path to the table sample data directory
             sql_pairs_dir: Path to the sample SQL pairs directory
             embedding_model: Name of the SentenceTransformer model to use
+            default_table: Table to fall back to when a query gives nothing to search on
+            quantization: Compress stored schema embeddings ("fp16" or "int8"), or None for FP32.
+                "auto" keeps FP32 when faiss sees a GPU, since only FP32 flat and IVF
+                indices can be copied to it (see _move_to_gpu), and uses "fp16" otherwise
+            index_type: "flat" for exact search, "hnsw" for an approximate graph index,
+                or "ivfpq" for product-quantized inverted lists once the schema has
+                at least IVFPQ_MIN_ENTRIES entries
+            rerank: With quantization, also keep FP32 embeddings and rerank the
+                quantized shortlist of RERANK_K_FACTOR * k candidates with them
+            use_onnx: Run the embedding model with ONNX Runtime when no GPU is
+                available, exporting it next to the vector DB on first use
         """
+        if quantization == "auto":
+            quantization = None if faiss.get_num_gpus() > 0 else "fp16"
+        if quantization is not None and quantization not in _SCALAR_QUANTIZERS:
+            raise ValueError(f"Unsupported quantization: {quantization}")
+        if index_type not in _INDEX_TYPES:
+            raise ValueError(f"Unsupported index type: {index_type}")
+        
         self.vector_db_path = vector_db_path
+        self.default_table = default_table
         self.schema_dir = schema_dir
         self.table_heads_dir = table_heads_dir
         self.sql_pairs_dir = sql_pairs_dir
+        self.quantization = quantization
+        self.index_type = index_type
+        self.rerank = rerank
         
         # Create directories if they don't exist
         for dir_path in [vector_db_path, schema_dir, table_heads_dir, sql_pairs_dir]:
             Path(dir_path).mkdir(parents=True, exist_ok=True)
         
+        # Batched schema searches are cheaper as one matrix product
+        faiss.cvar.distance_compute_blas_threshold = BLAS_BATCH_THRESHOLD
+        
+        # Encoding benefits from intra-op parallelism, small index searches do not
+        torch.set_num_threads(max(1, (os.cpu_count() or 1) // 2))
+        faiss.omp_set_num_threads(SEARCH_OMP_THREADS)
+        
         # Load embedding model
-        self.embedding_model = SentenceTransformer(embedding_model)
+        self.embedding_model = _get_embedding_model(embedding_model)
+        if use_onnx:
+            self.embedding_model = self._load_onnx_encoder(embedding_model)
         self.embedding_dimension = self.embedding_model.get_sentence_embedding_dimension()
         
         # Initialize vector database components
         self.schema_index = None
+        # GPU copy of schema_index used for unfiltered searches, see _move_to_gpu()
+        self._gpu_index = None
+        self._gpu_resources = None
         self.schema_texts = []
         self.schema_metadata = []
+        # Entries queued by _add_to_index until the next _flush()
+        self._pending_texts: List[str] = []
+        self._pending_metadata: List[Dict[str, Any]] = []
+        self._date_column_index: Dict[str, Optional[str]] = {}
+        self._table_metadata: Dict[str, Mapping[str, Any]] = {}
+        self._table_schemas: Optional[Dict[str, Dict[str, Any]]] = None
+        self._filtered_vectors: "OrderedDict[Tuple, Tuple[np.ndarray, np.ndarray]]" = OrderedDict()
+        self._filtered_vectors_lock = threading.Lock()
+        self._query_embeddings: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        # Searches run concurrently from the agents' executor threads
+        self._query_embeddings_lock = threading.Lock()
         
         # Load schema index if it exists
         self._load_or_create_indices()
     
+    def _load_onnx_encoder(self, model_name: str):
+        """
+        Wrap the embedding model for ONNX Runtime, keeping PyTorch as the fallback.
+        
+        Args:
+            model_name: Name of the SentenceTransformer model
+            
+        Returns:
+            The ONNX encoder, or the SentenceTransformer if it cannot be used
+        """
+        if torch.cuda.is_available():
+            logger.info("GPU available, keeping the PyTorch embedding model")
+            return self.embedding_model
+        
+        onnx_path = os.path.join(self.vector_db_path, f"{model_name.replace('/', '_')}.onnx")
+        try:
+            return _OnnxSentenceEncoder(self.embedding_model, onnx_path)
+        except Exception as e:
+            logger.warning(f"Using the PyTorch embedding model, ONNX Runtime unavailable: {str(e)}")
+            return self.embedding_model
+    
     def _load_or_create_indices(self):
         """Load existing vector indices or create new ones."""
         schema_index_path = os.path.join(self.vector_db_path, "schema_index.faiss")
@@ -62,24 +359,35 @@ class MetaStore:
         
         if os.path.exists(schema_index_path) and os.path.exists(metadata_path):
             try:
-                # Load FAISS index
-                self.schema_index = faiss.read_index(schema_index_path)
+                # Load FAISS index, memory-mapped so worker processes share the page cache
+                self.schema_index = faiss.read_index(
+                    schema_index_path, faiss.IO_FLAG_MMAP | faiss.IO_FLAG_READ_ONLY
+                )
                 
                 # Load metadata
-                with open(metadata_path, 'r') as f:
-                    data = json.load(f)
+                with open(metadata_path, 'rb') as f:
+                    data = orjson.loads(f.read())
                     self.schema_texts = data.get('texts', [])
                     self.schema_metadata = data.get('metadata', [])
                 
+                # Compress an index saved before quantization was enabled
+                with _faiss_threads(os.cpu_count() or 1):
+                    quantized = self._quantize_index()
+                if quantized:
+                    self._save_indices()
+                
+                self._build_date_column_index()
+                self._move_to_gpu()
                 logger.info(f"Loaded existing schema index with {len(self.schema_texts)} entries")
                 return
             except Exception as e:
                 logger.error(f"Error loading indices: {str(e)}")
         
         # Create new indices if loading failed or files don't exist
-        self.schema_index = faiss.IndexFlatL2(self.embedding_dimension)
+        self.schema_index = self._new_index()
         self.schema_texts = []
         self.schema_metadata = []
+        self._date_column_index = {}
         logger.info("Created new schema indices")
     
     def _save_indices(self):
@@ -92,11 +400,11 @@ class MetaStore:
             faiss.write_index(self.schema_index, schema_index_path)
             
             # Save metadata
-            with open(metadata_path, 'w') as f:
-                json.dump({
+            with open(metadata_path, 'wb') as f:
+                f.write(orjson.dumps({
                     'texts': self.schema_texts,
                     'metadata': self.schema_metadata
-                }, f, indent=2)
+                }))
             
             logger.info(f"Saved schema index with {len(self.schema_texts)} entries")
             return True
@@ -111,21 +419,20 @@ class MetaStore:
         """
         try:
             # Clear existing index
-            self.schema_index = faiss.IndexFlatL2(self.embedding_dimension)
+            self.schema_index = self._new_index()
+            self._gpu_index = None
             self.schema_texts = []
             self.schema_metadata = []
+            self._pending_texts = []
+            self._pending_metadata = []
+            self._table_metadata = {}
+            self._table_schemas = None
+            self._invalidate_filtered_vectors()
             
-            # Get all schema files
-            schema_files = [f for f in os.listdir(self.schema_dir) 
-                           if f.endswith('_schema.json') and not f.startswith('complete')]
+            table_schemas = self._load_table_schemas()
             
-            for schema_file in schema_files:
-                with open(os.path.join(self.schema_dir, schema_file), 'r') as f:
-                    schema_data = json.load(f)
-                
-                table_name = schema_data.get('table_name', '')
-                if not table_name:
-                    continue
+            for table_name, schema_data in table_schemas.items():
+                schema_file = f"{table_name}_schema.json"
                 
                 # Index table name with description
                 table_text = f"Table: {table_name}"
@@ -156,6 +463,7 @@ class MetaStore:
                             'table_name': table_name,
                             'column_name': column_name,
                             'column_type': column_type,
+                            'is_date': column.get('is_date'),
                             'file': schema_file
                         }
                     )
@@ -183,9 +491,14 @@ class MetaStore:
                         }
                     )
             
-            # Save the updated indices
+            # Embed every entry in one batched pass, then save the updated indices
+            with _faiss_threads(os.cpu_count() or 1):
+                self._flush()
+                self._quantize_index()
+            self._build_date_column_index()
             self._save_indices()
-            logger.info(f"Successfully indexed schema data from {len(schema_files)} tables")
+            self._move_to_gpu()
+            logger.info(f"Successfully indexed schema data from {len(table_schemas)} tables")
             return True
             
         except Exception as e:
@@ -194,51 +507,423 @@ class MetaStore:
     
     def _add_to_index(self, text: str, metadata: Dict[str, Any]):
         """
-        Add a text entry with metadata to the vector index.
+        Queue a text entry with metadata for the vector index.
+        
+        The entry is embedded and added by the next _flush().
         
         Args:
             text: Text to embed and index
             metadata: Associated metadata to store
         """
-        # Get embedding and add to FAISS index
-        embedding = self.embedding_model.encode([text])[0]
-        self.schema_index.add(np.array([embedding], dtype=np.float32))
+        self._pending_texts.append(text)
+        self._pending_metadata.append(metadata)
+    
+    def _flush(self):
+        """Embed all queued entries in a single encode call and add them to the index."""
+        if not self._pending_texts:
+            return
+        
+        # Embed each distinct text once and gather the rows back per entry;
+        # faiss takes one C-contiguous (N, d) float32 block for a single add
+        unique_texts = list(dict.fromkeys(self._pending_texts))
+        embeddings = np.ascontiguousarray(self.embedding_model.encode(
+            unique_texts,
+            batch_size=EMBEDDING_BATCH_SIZE,
+            show_progress_bar=False,
+            convert_to_numpy=True,
+            normalize_embeddings=True
+        ), dtype=np.float32)
+        
+        if len(unique_texts) < len(self._pending_texts):
+            positions = {text: i for i, text in enumerate(unique_texts)}
+            embeddings = embeddings[[positions[text] for text in self._pending_texts]]
+            logger.info(f"Embedded {len(unique_texts)} unique texts for {len(self._pending_texts)} entries")
+        
+        # IVFPQ has to be trained on the data, so it replaces the empty flat index here
+        if (self.index_type == "ivfpq" and self.schema_index.ntotal == 0
+                and len(embeddings) >= IVFPQ_MIN_ENTRIES):
+            self.schema_index = self._new_ivfpq_index(embeddings)
+        
+        self.schema_index.add(embeddings)
         
         # Store text and metadata
-        self.schema_texts.append(text)
-        self.schema_metadata.append(metadata)
+        self.schema_texts.extend(self._pending_texts)
+        self.schema_metadata.extend(self._pending_metadata)
+        self._pending_texts = []
+        self._pending_metadata = []
+        self._invalidate_filtered_vectors()
+    
+    def _new_index(self, quantizer_type: Optional[int] = None) -> faiss.Index:
+        """
+        Create an empty schema index of the configured type.
+        
+        For "ivfpq" this is a flat index; _flush() swaps in an IVFPQ index
+        when there are enough entries to train one.
+        
+        Args:
+            quantizer_type: faiss scalar quantizer type, or None to store FP32 vectors
+            
+        Returns:
+            A new faiss index; quantized indices must be trained before use
+        """
+        dimension = self.embedding_dimension
+        
+        # Embeddings are L2-normalized, so inner product is cosine similarity
+        if self.index_type == "hnsw":
+            if quantizer_type is None:
+                index = faiss.IndexHNSWFlat(dimension, HNSW_M, faiss.METRIC_INNER_PRODUCT)
+            else:
+                index = faiss.IndexHNSWSQ(dimension, quantizer_type, HNSW_M, faiss.METRIC_INNER_PRODUCT)
+            index.hnsw.efConstruction = HNSW_EF_CONSTRUCTION
+            return index
+        
+        if quantizer_type is None:
+            return faiss.IndexFlatIP(dimension)
+        return faiss.IndexScalarQuantizer(dimension, quantizer_type, faiss.METRIC_INNER_PRODUCT)
+    
+    def _new_ivfpq_index(self, embeddings: np.ndarray) -> faiss.Index:
+        """
+        Create an IVFPQ schema index trained on the given embeddings.
+        
+        Args:
+            embeddings: Normalized embeddings the index will hold
+            
+        Returns:
+            A trained, empty IndexIVFPQ
+        """
+        nlist = int(4 * np.sqrt(len(embeddings)))
+        quantizer = faiss.IndexFlatIP(self.embedding_dimension)
+        index = faiss.IndexIVFPQ(
+            quantizer, self.embedding_dimension, nlist, IVFPQ_M, IVFPQ_NBITS,
+            faiss.METRIC_INNER_PRODUCT
+        )
+        index.train(embeddings)
+        index.nprobe = IVFPQ_NPROBE
+        # Filtered searches reconstruct entries by position
+        index.make_direct_map()
+        logger.info(f"Trained IVFPQ schema index with {nlist} lists on {len(embeddings)} entries")
+        return index
+    
+    def _quantize_index(self):
+        """
+        Replace the FP32 schema index with a scalar-quantized copy, wrapped
+        for exact FP32 reranking of its shortlist when rerank is enabled.
+        
+        The quantized index is only kept if its recall against the FP32 index,
+        measured on the stored embeddings, stays at or above MIN_QUANTIZED_RECALL.
+        
+        Returns:
+            bool: True if the index was replaced, False otherwise
+        """
+        if not self.quantization or self.schema_index.ntotal == 0:
+            return False
+        
+        # Only full-precision indices can be quantized (e.g. not one loaded already compressed)
+        if not isinstance(self.schema_index, (faiss.IndexFlat, faiss.IndexHNSWFlat)):
+            return False
+        
+        embeddings = self.schema_index.reconstruct_n(0, self.schema_index.ntotal)
+        quantized_index = self._new_index(_SCALAR_QUANTIZERS[self.quantization])
+        if self.rerank:
+            # Coarse int8 scan for a shortlist, exact FP32 distances for the final top-k
+            quantized_index = faiss.IndexRefineFlat(quantized_index)
+            quantized_index.k_factor = RERANK_K_FACTOR
+        quantized_index.train(embeddings)
+        quantized_index.add(embeddings)
+        
+        # Compare top-k neighbours of a sample of stored vectors
+        sample = embeddings[:256]
+        k = min(5, self.schema_index.ntotal)
+        _, reference = self.schema_index.search(sample, k)
+        _, candidate = quantized_index.search(sample, k)
+        hits = sum(len(set(ref_row) & set(cand_row)) for ref_row, cand_row in zip(reference, candidate))
+        recall = hits / reference.size
+        
+        if recall < MIN_QUANTIZED_RECALL:
+            logger.warning(f"{self.quantization} quantization recall {recall:.3f} is below "
+                           f"{MIN_QUANTIZED_RECALL}, keeping the FP32 index")
+            return False
+        
+        self.schema_index = quantized_index
+        self._invalidate_filtered_vectors()
+        logger.info(f"Quantized schema index to {self.quantization} (recall {recall:.3f})")
+        return True
+    
+    def _move_to_gpu(self):
+        """
+        Copy the schema index to the first GPU for unfiltered searches.
+        
+        schema_index stays on the host and remains the copy that is saved,
+        quantized and reconstructed for filtered searches. Index types faiss
+        cannot run on a GPU (HNSW, non-IVF scalar quantizers, refine wrappers)
+        keep searching on the CPU.
+        """
+        self._gpu_index = None
+        if self.schema_index.ntotal < GPU_MIN_ENTRIES or faiss.get_num_gpus() == 0:
+            return
+        
+        try:
+            if self._gpu_resources is None:
+                self._gpu_resources = faiss.StandardGpuResources()
+            self._gpu_index = faiss.index_cpu_to_gpu(self._gpu_resources, 0, self.schema_index)
+            logger.info(f"Moved schema index with {self.schema_index.ntotal} entries to GPU")
+        except (AttributeError, RuntimeError) as e:
+            logger.warning(f"Searching the schema index on CPU, GPU copy failed: {str(e)}")
     
-    def search_schema(self, query: str, k: int = 5) -> List[Dict[str, Any]]:
+    def _build_date_column_index(self):
+        """
+        Precompute the date column of every indexed table.
+        
+        A column whose type is a DATE/TIME/TIMESTAMP wins; otherwise the first
+        column with a date-like name is used. Columns flagged as not date-like
+        by extract_schema are skipped without pattern matching.
+        """
+        by_type: Dict[str, str] = {}
+        by_name: Dict[str, str] = {}
+        tables = set()
+        
+        for metadata in self.schema_metadata:
+            table_name = metadata.get('table_name', '')
+            tables.add(table_name)
+            if metadata.get('type') != 'column' or metadata.get('is_date') is False:
+                continue
+            
+            column_name = metadata.get('column_name', '')
+            if table_name not in by_type and DATE_TYPE_RE.search(metadata.get('column_type', '')):
+                by_type[table_name] = column_name
+            elif table_name not in by_name and DATE_NAME_RE.search(column_name):
+                by_name[table_name] = column_name
+        
+        self._date_column_index = {
+            table_name: by_type.get(table_name, by_name.get(table_name))
+            for table_name in tables
+        }
+    
+    def get_date_column(self, table_name: str) -> Optional[str]:
+        """
+        Get the column to use for temporal filtering on a table.
+        
+        Args:
+            table_name: Name of the table
+            
+        Returns:
+            The date column name, or None if the table has none
+        """
+        return self._date_column_index.get(table_name)
+    
+    def search_schema(self, query: str, k: int = 5,
+                      filter: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
         """
         Search the schema index for relevant database elements.
         
         Args:
             query: Natural language query to search for
             k: Number of results to return
+            filter: Optional metadata conditions, e.g. {"table": "orders"}
             
         Returns:
             List of dictionaries containing matched schema elements with their metadata
         """
+        return self.search_schema_batch([query], k, filter=filter)[0]
+    
+    def search_schema_batch(self, queries: List[str], k: int = 5,
+                            filter: Optional[Dict[str, Any]] = None) -> List[List[Dict[str, Any]]]:
+        """
+        Search the schema index for several queries at once.
+        
+        All queries are embedded in a single model call and searched with a
+        single index lookup. With a filter, only the matching entries are
+        scored instead of post-filtering a global top-k.
+        
+        Args:
+            queries: Natural language queries to search for
+            k: Number of results to return per query
+            filter: Optional metadata conditions, e.g. {"table": "orders"}
+            
+        Returns:
+            One list of matched schema elements per query, in input order
+        """
+        if not queries:
+            return []
+        
         if not self.schema_index or self.schema_index.ntotal == 0:
             logger.warning("Schema index is empty, nothing to search")
-            return []
+            return [[] for _ in queries]
+        
+        # Compute query embeddings
+        query_embeddings = self._embed_queries(queries)
         
-        # Compute query embedding
-        query_embedding = self.embedding_model.encode([query])[0]
-        query_embedding = np.array([query_embedding], dtype=np.float32)
+        if filter:
+            return self._search_filtered(query_embeddings, k, filter)
         
         # Search the index
         k = min(k, self.schema_index.ntotal)
-        distances, indices = self.schema_index.search(query_embedding, k)
+        if self._gpu_index is not None:
+            distances, indices = self._gpu_index.search(query_embeddings, k)
+        else:
+            searched_index = self.schema_index
+            if isinstance(searched_index, faiss.IndexRefine):
+                # The base index has to return the whole rerank shortlist
+                searched_index = faiss.downcast_index(searched_index.base_index)
+                k_shortlist = k * RERANK_K_FACTOR
+            else:
+                k_shortlist = k
+            if hasattr(searched_index, 'hnsw'):
+                searched_index.hnsw.efSearch = max(HNSW_EF_SEARCH, HNSW_EF_SEARCH_PER_K * k_shortlist)
+            distances, indices = self.schema_index.search(query_embeddings, k)
+        
+        return [
+            self._collect_results(distances[row], indices[row])
+            for row in range(len(queries))
+        ]
+    
+    def _search_filtered(self, query_embeddings: np.ndarray, k: int,
+                         filter: Dict[str, Any]) -> List[List[Dict[str, Any]]]:
+        """
+        Exhaustively search only the index entries matching a filter.
+        
+        Args:
+            query_embeddings: Query embedding matrix
+            k: Number of results to return per query
+            filter: Metadata conditions the entries must satisfy
+            
+        Returns:
+            One list of matched schema elements per query
+        """
+        row_ids, vectors = self._get_filtered_vectors(filter)
+        if len(row_ids) == 0:
+            return [[] for _ in range(len(query_embeddings))]
+        
+        # faiss computes the index metric and keeps a top-k heap per query
+        # in one native pass, without materializing the distance matrix
+        k = min(k, len(row_ids))
+        top_distances, top = faiss.knn(
+            query_embeddings, vectors, k, metric=self.schema_index.metric_type
+        )
+        
+        return [
+            self._collect_results(top_distances[row], row_ids[top[row]])
+            for row in range(len(query_embeddings))
+        ]
+    
+    def _get_filtered_vectors(self, filter: Dict[str, Any]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Get the row ids and vectors of the entries matching a filter.
+        
+        The vectors are gathered into a contiguous matrix once per filter and
+        reused until the index changes; only the FILTERED_VECTORS_CACHE_SIZE
+        most recently used filters are kept.
+        
+        Args:
+            filter: Metadata conditions the entries must satisfy
+            
+        Returns:
+            Tuple of (row ids, vector matrix)
+        """
+        key = tuple(sorted(filter.items()))
+        with self._filtered_vectors_lock:
+            cached = self._filtered_vectors.get(key)
+            if cached is not None:
+                self._filtered_vectors.move_to_end(key)
+                return cached
+        
+        conditions = [(_FILTER_FIELDS.get(field, field), value) for field, value in filter.items()]
+        row_ids = np.array([
+            idx for idx, metadata in enumerate(self.schema_metadata)
+            if all(metadata.get(field) == value for field, value in conditions)
+        ], dtype=np.int64)
+        
+        if len(row_ids):
+            vectors = np.ascontiguousarray(self.schema_index.reconstruct_batch(row_ids), dtype=np.float32)
+        else:
+            vectors = np.empty((0, self.schema_index.d), dtype=np.float32)
+        
+        cached = (row_ids, vectors)
+        with self._filtered_vectors_lock:
+            self._filtered_vectors[key] = cached
+            while len(self._filtered_vectors) > FILTERED_VECTORS_CACHE_SIZE:
+                self._filtered_vectors.popitem(last=False)
+        return cached
+    
+    def _invalidate_filtered_vectors(self):
+        """Drop the cached filtered vectors once the index contents change."""
+        with self._filtered_vectors_lock:
+            self._filtered_vectors.clear()
+    
+    def embed_query(self, query: str) -> np.ndarray:
+        """
+        Embed a search query the way search_schema does, sharing its embedding cache.
+        
+        Args:
+            query: Query string to embed
+            
+        Returns:
+            The normalized float32 query embedding
+        """
+        return self._embed_queries([query])[0]
+    
+    def _embed_queries(self, queries: List[str]) -> np.ndarray:
+        """
+        Embed search queries, reusing cached embeddings for repeated queries.
+        
+        Args:
+            queries: Query strings to embed
+            
+        Returns:
+            A (len(queries), embedding_dimension) float32 matrix
+        """
+        cache = self._query_embeddings
+        
+        # Take the cached embeddings under the lock; other threads may evict them afterwards
+        with self._query_embeddings_lock:
+            found = {query: cache[query] for query in dict.fromkeys(queries) if query in cache}
+        
+        # Encode only queries not seen before, each once, in a single model call
+        missing = [query for query in dict.fromkeys(queries) if query not in found]
+        encoded = np.asarray(
+            self.embedding_model.encode(missing, normalize_embeddings=True), dtype=np.float32
+        ) if missing else []
+        found.update(zip(missing, encoded))
+        
+        with self._query_embeddings_lock:
+            for query, embedding in found.items():
+                cache[query] = embedding
+                cache.move_to_end(query)
+            while len(cache) > QUERY_EMBEDDING_CACHE_SIZE:
+                cache.popitem(last=False)
+        
+        return np.stack([found[query] for query in queries])
+    
+    def _collect_results(self, distances: np.ndarray, indices: np.ndarray) -> List[Dict[str, Any]]:
+        """
+        Convert one row of index search output into result dictionaries.
+        
+        Each result carries the matched element's 'name' (its column name, or
+        its table name for table and foreign key entries), a 'score' (cosine
+        similarity, higher is better) and a 'distance' (lower is better).
+        
+        Args:
+            distances: Distances or similarities returned by the index for one query
+            indices: Entry positions returned by the index for one query
+            
+        Returns:
+            List of dictionaries containing matched schema elements with their metadata
+        """
+        # Indices saved before the switch to inner product still report squared L2,
+        # which for unit vectors is 2 - 2 * cosine similarity
+        inner_product = self.schema_index.metric_type == faiss.METRIC_INNER_PRODUCT
         
-        # Collect results
         results = []
-        for i, idx in enumerate(indices[0]):
+        for i, idx in enumerate(indices):
             if idx < len(self.schema_texts) and idx >= 0:
+                value = float(distances[i])
+                metadata = self.schema_metadata[idx]
                 results.append({
+                    'name': metadata.get('column_name') or metadata.get('table_name', ''),
                     'text': self.schema_texts[idx],
-                    'metadata': self.schema_metadata[idx],
-                    'distance': float(distances[0][i])
+                    'metadata': metadata,
+                    'score': value if inner_product else 1.0 - value / 2.0,
+                    'distance': 1.0 - value if inner_product else value
                 })
         
         return results
@@ -253,17 +938,143 @@ class MetaStore:
         Returns:
             Dictionary containing table schema or empty dict if not found
         """
-        schema_file = os.path.join(self.schema_dir, f"{table_name}_schema.json")
-        if not os.path.exists(schema_file):
+        schema = self._load_table_schemas().get(table_name)
+        if schema is None:
             logger.warning(f"Schema file for table {table_name} not found")
             return {}
         
+        return schema
+    
+    def _load_table_schemas(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Load every table schema from the schema directory, once per index build.
+        
+        Reads the packed schema file when extract_schema has written one and
+        falls back to the individual *_schema.json files otherwise.
+        
+        Returns:
+            Dictionary mapping table name to its schema
+        """
+        if self._table_schemas is not None:
+            return self._table_schemas
+        
+        table_schemas = {}
+        pack_path = os.path.join(self.schema_dir, SCHEMA_PACK_FILE)
+        if os.path.exists(pack_path):
+            try:
+                with open(pack_path, 'rb') as f:
+                    table_schemas = orjson.loads(f.read())
+            except Exception as e:
+                logger.error(f"Error loading schema pack: {str(e)}")
+                table_schemas = {}
+        
+        if not table_schemas:
+            schema_files = sorted(f for f in os.listdir(self.schema_dir) 
+                                  if f.endswith('_schema.json') and not f.startswith('complete'))
+            
+            # Reads and decodes overlap across threads; results keep file order
+            if schema_files:
+                with ThreadPoolExecutor(max_workers=min(SCHEMA_READ_WORKERS, len(schema_files))) as executor:
+                    parsed = list(executor.map(self._parse_schema_file, schema_files))
+                
+                for schema_data in parsed:
+                    table_name = schema_data.get('table_name', '') if schema_data else ''
+                    if table_name:
+                        table_schemas[table_name] = schema_data
+        
+        self._table_schemas = table_schemas
+        return table_schemas
+    
+    def _parse_schema_file(self, schema_file: str) -> Optional[Dict[str, Any]]:
+        """
+        Read one table schema file from the schema directory.
+        
+        Args:
+            schema_file: File name of the table schema
+            
+        Returns:
+            The parsed schema, or None if it could not be read
+        """
         try:
-            with open(schema_file, 'r') as f:
-                return json.load(f)
+            with open(os.path.join(self.schema_dir, schema_file), 'rb') as f:
+                return orjson.loads(f.read())
         except Exception as e:
-            logger.error(f"Error loading schema for table {table_name}: {str(e)}")
+            logger.error(f"Error loading schema file {schema_file}: {str(e)}")
+            return None
+    
+    def get_table_metadata(self, table_name: str) -> Mapping[str, Any]:
+        """
+        Get column-level metadata for a table in the layout used by the agents.
+        
+        The result is built once per table from its schema file and shared by
+        later calls, so it is returned as a read-only view: mappings are
+        MappingProxyType and lists are tuples.
+        
+        Args:
+            table_name: Name of the table
+            
+        Returns:
+            Dictionary with the table's columns, the columns grouped by role
+            and a precomputed {column_name: data_type} map, or empty dict if not found
+        """
+        table_metadata = self._table_metadata.get(table_name)
+        if table_metadata is not None:
+            return table_metadata
+        
+        schema = self.get_schema_for_table(table_name)
+        if not schema:
             return {}
+        
+        primary_keys = set(schema.get('primary_keys', []))
+        columns = tuple(
+            MappingProxyType({
+                'name': column.get('name', ''),
+                'data_type': column.get('type', ''),
+                'nullable': column.get('nullable', True),
+                'default': column.get('default', ''),
+                'description': column.get('description', ''),
+                'is_primary_key': column.get('name', '') in primary_keys,
+                'is_date': column.get('is_date'),
+                'role': self._column_role(column.get('name', ''), primary_keys),
+                # Lowercased name for case-insensitive pattern checks
+                '_lc_name': column.get('name', '').lower()
+            })
+            for column in schema.get('columns', [])
+        )
+        
+        table_metadata = MappingProxyType({
+            'table_name': table_name,
+            'description': schema.get('description', ''),
+            'columns': columns,
+            'columns_by_role': MappingProxyType({
+                role: tuple(column for column in columns if column['role'] == role)
+                for role in ('key', 'display', 'other')
+            }),
+            'foreign_keys': tuple(MappingProxyType(fk) for fk in schema.get('foreign_keys', [])),
+            'field_types': MappingProxyType({column['name']: column['data_type'] for column in columns})
+        })
+        self._table_metadata[table_name] = table_metadata
+        return table_metadata
+    
+    @staticmethod
+    def _column_role(column_name: str, primary_keys: set) -> str:
+        """
+        Classify a column for default output column selection.
+        
+        Args:
+            column_name: Name of the column
+            primary_keys: Primary key column names of its table
+            
+        Returns:
+            'key' for primary keys and ID columns, 'display' for name-like
+            columns, 'other' otherwise
+        """
+        lc_name = column_name.lower()
+        if column_name in primary_keys or 'id' in lc_name:
+            return 'key'
+        if _DISPLAY_NAME_RE.search(lc_name):
+            return 'display'
+        return 'other'
     
     def get_sample_data_for_table(self, table_name: str) -> Optional[Dict[str, Any]]:
         """
@@ -275,14 +1086,24 @@ class MetaStore:
         Returns:
             Dictionary containing sample data or None if not found
         """
+        arrow_file = os.path.join(self.table_heads_dir, f"{table_name}_samples.arrow")
         sample_file = os.path.join(self.table_heads_dir, f"{table_name}_samples.json")
-        if not os.path.exists(sample_file):
+        csv_file = os.path.join(self.table_heads_dir, f"{table_name}_samples.csv")
+        if not any(os.path.exists(path) for path in (arrow_file, sample_file, csv_file)):
             logger.warning(f"Sample data for table {table_name} not found")
             return None
         
         try:
-            with open(sample_file, 'r') as f:
-                return json.load(f)
+            if os.path.exists(arrow_file):
+                return feather.read_table(arrow_file, memory_map=True).to_pylist()
+            
+            # Samples extracted before the Arrow format was used
+            if os.path.exists(sample_file):
+                with open(sample_file, 'rb') as f:
+                    return orjson.loads(f.read())
+            
+            with open(csv_file, 'r', newline='') as f:
+                return list(csv.DictReader(f))
         except Exception as e:
             logger.error(f"Error loading sample data for table {table_name}: {str(e)}")
             return None
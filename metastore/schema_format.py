@@ -0,0 +1,18 @@
+"""
+Schema file conventions shared by the schema extractor and the MetaStore.
+
+extract_schema writes the schema files that MetaStore reads, so anything
+both sides have to agree on is defined here once.
+"""
+
+import re
+
+# Patterns marking a column as usable for temporal filtering: extract_schema
+# records them as each column's is_date flag, MetaStore falls back on them
+# for schema files written without it
+DATE_TYPE_RE = re.compile(r"DATE|TIME", re.IGNORECASE)
+DATE_NAME_RE = re.compile(r"date|time|created|updated|timestamp", re.IGNORECASE)
+
+# Packed {table_name: schema} file written alongside the per-table schema
+# files, so MetaStore can load every schema with a single parse
+SCHEMA_PACK_FILE = "schema_pack.json"
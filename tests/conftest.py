@@ -0,0 +1,81 @@
+"""
+Shared fixtures for the Text2SQL tests.
+"""
+
+import sys
+import types
+from pathlib import Path
+
+import orjson
+import pytest
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+# The agents import the project as the text2sql package (see
+# docs/project_structure.md); map that name onto this checkout
+if "text2sql" not in sys.modules:
+    _package = types.ModuleType("text2sql")
+    _package.__path__ = [str(REPO_ROOT)]
+    sys.modules["text2sql"] = _package
+
+# Table schemas in the layout written by metastore/extract_schema.py
+TABLE_SCHEMAS = {
+    "tickets": {
+        "table_name": "tickets",
+        "description": "Customer support tickets",
+        "columns": [
+            {"name": "ticket_id", "type": "INTEGER", "nullable": False, "is_date": False},
+            {"name": "status", "type": "VARCHAR(20)", "nullable": True, "is_date": False},
+            {"name": "priority", "type": "VARCHAR(10)", "nullable": True, "is_date": False},
+            {"name": "customer_id", "type": "INTEGER", "nullable": False, "is_date": False},
+            {"name": "created_at", "type": "TIMESTAMP", "nullable": False, "is_date": True}
+        ],
+        "primary_keys": ["ticket_id"],
+        "foreign_keys": [
+            {
+                "constrained_columns": ["customer_id"],
+                "referred_table": "customers",
+                "referred_columns": ["customer_id"]
+            }
+        ]
+    },
+    "customers": {
+        "table_name": "customers",
+        "description": "Customer accounts",
+        "columns": [
+            {"name": "customer_id", "type": "INTEGER", "nullable": False, "is_date": False},
+            {"name": "name", "type": "VARCHAR(100)", "nullable": False, "is_date": False},
+            {"name": "email", "type": "VARCHAR(255)", "nullable": True, "is_date": False}
+        ],
+        "primary_keys": ["customer_id"],
+        "foreign_keys": []
+    }
+}
+
+
+def build_metastore(tmp_path, **kwargs):
+    """Index TABLE_SCHEMAS into a MetaStore under tmp_path; kwargs go to MetaStore."""
+    pytest.importorskip("faiss")
+    pytest.importorskip("sentence_transformers")
+    from text2sql.metastore.metastore import MetaStore
+    
+    schema_dir = tmp_path / "db_metadata"
+    schema_dir.mkdir(exist_ok=True)
+    for table_name, schema in TABLE_SCHEMAS.items():
+        (schema_dir / f"{table_name}_schema.json").write_bytes(orjson.dumps(schema))
+    
+    store = MetaStore(
+        vector_db_path=str(tmp_path / "vector_db"),
+        schema_dir=str(schema_dir),
+        table_heads_dir=str(tmp_path / "table_heads"),
+        sql_pairs_dir=str(tmp_path / "sql_pairs"),
+        **kwargs
+    )
+    assert store.index_schema_data()
+    return store
+
+
+@pytest.fixture
+def metastore(tmp_path):
+    """A MetaStore with TABLE_SCHEMAS indexed into a temporary vector DB."""
+    return build_metastore(tmp_path)
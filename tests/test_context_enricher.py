@@ -0,0 +1,53 @@
+"""
+Tests for the ContextEnricher against a real MetaStore.
+"""
+
+import pytest
+
+pytest.importorskip("faiss")
+pytest.importorskip("sentence_transformers")
+
+from text2sql.agents.context_agent.context_enricher import ContextEnricher
+
+
+def _decomposed_query(intent, entities):
+    return {
+        "query_decomposition": {
+            "intent": {"goal": intent},
+            "context": {
+                "description": "Support tickets by status and priority",
+                "expected_output": "Number of tickets"
+            },
+            "entity_extraction": entities
+        }
+    }
+
+
+def test_enrich_query_searches_for_primary_table(metastore):
+    enricher = ContextEnricher(metastore)
+    
+    contextual_data = enricher.enrich_query(_decomposed_query(
+        "count_tickets",
+        [{"entity_type": "status", "entity_value": "open", "mapped_column": "status"}]
+    ))
+    
+    assert not contextual_data["short_circuited"]
+    assert contextual_data["table_metadata"]["primary_table"] == "tickets"
+    assert contextual_data["filters"] == [
+        {"filter_name": "status", "column_name": "status", "operator": "=", "value": "open"}
+    ]
+    assert [column["column_name"] for column in contextual_data["output_columns"]] == [
+        "ticket_id", "customer_id"
+    ]
+
+
+def test_enrich_query_maps_unmapped_entities_with_filtered_search(metastore):
+    enricher = ContextEnricher(metastore)
+    
+    contextual_data = enricher.enrich_query(_decomposed_query(
+        "count_tickets",
+        [{"entity_type": "priority", "entity_value": "high", "mapped_column": ""}]
+    ))
+    
+    assert contextual_data["table_metadata"]["primary_table"] == "tickets"
+    assert contextual_data["filters"][0]["column_name"] == "priority"
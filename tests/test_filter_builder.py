@@ -0,0 +1,81 @@
+"""
+Tests for FilterBuilder value processing.
+"""
+
+import datetime
+
+import pytest
+
+pytest.importorskip("faiss")
+pytest.importorskip("sentence_transformers")
+
+from text2sql.agents.context_agent.filter_builder import FilterBuilder
+
+
+class _FixedDate(datetime.date):
+    """A date whose today() is 2024-03-15, so resolved ranges are stable."""
+    
+    @classmethod
+    def today(cls):
+        return cls(2024, 3, 15)
+
+
+@pytest.fixture
+def filter_builder():
+    # Value processing does not consult the schema mapper
+    return FilterBuilder(schema_mapper=None)
+
+
+@pytest.mark.parametrize("value, expected", [
+    ("more than 5", 5),
+    ("at least 3", 3),
+    ("10 at most", 10),
+    ("5 minimum", 5),
+    ("maximum of 20 or 30", 20),
+    ("not open", "open"),
+    ("is not closed", "closed"),
+    ("Not more than 7", 7),
+    ("at most", "at most"),
+    ("open", "open"),
+])
+def test_process_filter_value_comparisons(filter_builder, value, expected):
+    assert filter_builder._process_filter_value(value, "=") == expected
+
+
+def test_process_filter_value_between(filter_builder):
+    assert filter_builder._process_filter_value("2024-01-01 to 2024-01-31", "BETWEEN") == [
+        "2024-01-01", "2024-01-31"
+    ]
+
+
+# Same output as the original if/elif resolution for every phrase it knew
+@pytest.mark.parametrize("expression, expected", [
+    ("today", ["2024-03-15"]),
+    ("yesterday", ["2024-03-14"]),
+    ("last week", ["2024-03-08", "2024-03-15"]),
+    ("last month", ["2024-02-14", "2024-03-15"]),
+    ("this year", ["2024-01-01", "2024-03-15"]),
+    ("last year", ["2023-01-01", "2023-12-31"]),
+    ("Last Week", ["2024-03-08", "2024-03-15"]),
+    # Unknown phrases fall back to the last 30 days
+    ("sometime", ["2024-02-14", "2024-03-15"]),
+    ("last 5 years", ["2024-02-14", "2024-03-15"]),
+])
+def test_resolve_temporal_expression_matches_baseline(filter_builder, monkeypatch, expression, expected):
+    monkeypatch.setattr(datetime, "date", _FixedDate)
+    
+    assert filter_builder._resolve_temporal_expression(expression) == expected
+
+
+# Parametric and padded phrases, which the original resolved to the last-30-days fallback
+@pytest.mark.parametrize("expression, expected", [
+    ("last 3 days", ["2024-03-12", "2024-03-15"]),
+    ("last 1 day", ["2024-03-14", "2024-03-15"]),
+    ("last 2 weeks", ["2024-03-01", "2024-03-15"]),
+    ("last 2 months", ["2024-01-15", "2024-03-15"]),
+    (" today ", ["2024-03-15"]),
+])
+def test_resolve_relative_temporal_expression(filter_builder, monkeypatch, expression, expected):
+    monkeypatch.setattr(datetime, "date", _FixedDate)
+    
+    assert filter_builder._resolve_temporal_expression(expression) == expected
@@ -0,0 +1,135 @@
+"""
+Tests for the MetaStore schema index types on synthetic embeddings.
+"""
+
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pytest
+
+faiss = pytest.importorskip("faiss")
+pytest.importorskip("sentence_transformers")
+
+from text2sql.metastore import metastore as metastore_module
+from text2sql.metastore.metastore import MetaStore, MIN_QUANTIZED_RECALL, IVFPQ_MIN_ENTRIES
+
+DIMENSION = 64
+
+
+def _normalized(vectors):
+    return (vectors / np.linalg.norm(vectors, axis=1, keepdims=True)).astype(np.float32)
+
+
+def _recall(reference, candidate):
+    return sum(len(set(ref) & set(cand)) for ref, cand in zip(reference, candidate)) / reference.size
+
+
+def _exact_neighbours(embeddings, queries, k):
+    index = faiss.IndexFlatIP(embeddings.shape[1])
+    index.add(embeddings)
+    return index.search(queries, k)[1]
+
+
+def _bare_store(embeddings, index_type="flat", quantization=None, rerank=False):
+    """A MetaStore holding the given embeddings, without an embedding model."""
+    store = MetaStore.__new__(MetaStore)
+    store.embedding_dimension = embeddings.shape[1]
+    store.index_type = index_type
+    store.quantization = quantization
+    store.rerank = rerank
+    store.schema_texts = [f"entry {i}" for i in range(len(embeddings))]
+    store.schema_metadata = [{'table_name': 't', 'column_name': f"c{i}"} for i in range(len(embeddings))]
+    store._filtered_vectors = OrderedDict()
+    store._filtered_vectors_lock = threading.Lock()
+    store._gpu_index = None
+    store.schema_index = store._new_index()
+    store.schema_index.add(embeddings)
+    return store
+
+
+@pytest.fixture
+def embeddings():
+    return _normalized(np.random.default_rng(0).standard_normal((2000, DIMENSION)))
+
+
+@pytest.mark.parametrize("index_type, quantization, rerank", [
+    ("flat", "fp16", False),
+    ("flat", "int8", False),
+    ("flat", "int8", True),
+    ("hnsw", "fp16", False),
+])
+def test_quantized_index_keeps_recall(embeddings, index_type, quantization, rerank):
+    store = _bare_store(embeddings, index_type, quantization, rerank)
+    queries = embeddings[:256]
+    
+    assert store._quantize_index()
+    assert not isinstance(store.schema_index, (faiss.IndexFlat, faiss.IndexHNSWFlat))
+    
+    reference = _exact_neighbours(embeddings, queries, 5)
+    candidate = store.schema_index.search(queries, 5)[1]
+    assert _recall(reference, candidate) >= MIN_QUANTIZED_RECALL
+
+
+def test_low_recall_quantizer_is_rejected():
+    # Near-duplicates plus the axis vectors: each dimension's int8 range spans
+    # [-1, 1], far too coarse to order the near-duplicates
+    rng = np.random.default_rng(0)
+    center = rng.standard_normal((1, DIMENSION))
+    embeddings = np.vstack([
+        _normalized(center + 0.001 * rng.standard_normal((500, DIMENSION))),
+        np.eye(DIMENSION, dtype=np.float32),
+        -np.eye(DIMENSION, dtype=np.float32)
+    ])
+    store = _bare_store(embeddings, quantization="int8")
+    
+    assert not store._quantize_index()
+    assert isinstance(store.schema_index, faiss.IndexFlatIP)
+
+
+def test_hnsw_search_matches_flat(embeddings, monkeypatch):
+    store = _bare_store(embeddings, index_type="hnsw")
+    queries = embeddings[:256]
+    monkeypatch.setattr(store, "_embed_queries", lambda _: queries)
+    
+    results = store.search_schema_batch([str(i) for i in range(len(queries))], k=5)
+    
+    reference = _exact_neighbours(embeddings, queries, 5)
+    candidate = np.array([[int(r['name'][1:]) for r in row] for row in results])
+    assert _recall(reference, candidate) >= MIN_QUANTIZED_RECALL
+    assert store.schema_index.hnsw.efSearch == metastore_module.HNSW_EF_SEARCH
+
+
+def test_hnsw_refine_sets_ef_search_on_base(embeddings, monkeypatch):
+    store = _bare_store(embeddings, index_type="hnsw", quantization="int8", rerank=True)
+    assert store._quantize_index()
+    assert isinstance(store.schema_index, faiss.IndexRefine)
+    monkeypatch.setattr(store, "_embed_queries", lambda _: embeddings[:1])
+    
+    store.search_schema_batch(["query"], k=50)
+    
+    base = faiss.downcast_index(store.schema_index.base_index)
+    expected = max(metastore_module.HNSW_EF_SEARCH,
+                   metastore_module.HNSW_EF_SEARCH_PER_K * 50 * metastore_module.RERANK_K_FACTOR)
+    assert base.hnsw.efSearch == expected
+
+
+def test_ivfpq_index(monkeypatch):
+    # Low intrinsic dimension, like real embeddings, so PQ codes stay accurate
+    rng = np.random.default_rng(0)
+    embeddings = _normalized(
+        rng.standard_normal((IVFPQ_MIN_ENTRIES, 8)) @ rng.standard_normal((8, DIMENSION))
+    )
+    store = _bare_store(embeddings[:0], index_type="ivfpq")
+    
+    index = store._new_ivfpq_index(embeddings)
+    index.add(embeddings)
+    
+    assert index.is_trained and index.nprobe == metastore_module.IVFPQ_NPROBE
+    queries = embeddings[:256]
+    candidate = index.search(queries, 10)[1]
+    # Every entry finds itself, and most of its exact neighbours
+    assert all(i in row for i, row in enumerate(candidate))
+    assert _recall(_exact_neighbours(embeddings, queries, 10), candidate) >= 0.7
+    # Filtered searches reconstruct entries by position
+    np.testing.assert_allclose(index.reconstruct(5), embeddings[5], atol=0.2)
@@ -0,0 +1,31 @@
+"""
+Tests for MetaStore index configuration.
+"""
+
+import pytest
+
+faiss = pytest.importorskip("faiss")
+
+from conftest import build_metastore
+
+
+@pytest.mark.parametrize("num_gpus, quantization, index_class", [
+    (0, "fp16", faiss.IndexScalarQuantizer),
+    (1, None, faiss.IndexFlatIP),
+])
+def test_auto_quantization_keeps_fp32_with_gpu(tmp_path, monkeypatch, num_gpus, quantization, index_class):
+    monkeypatch.setattr(faiss, "get_num_gpus", lambda: num_gpus)
+    
+    store = build_metastore(tmp_path)
+    
+    assert store.quantization == quantization
+    assert isinstance(store.schema_index, index_class)
+
+
+def test_explicit_quantization_is_kept_with_gpu(tmp_path, monkeypatch):
+    monkeypatch.setattr(faiss, "get_num_gpus", lambda: 1)
+    
+    store = build_metastore(tmp_path, quantization="fp16")
+    
+    assert store.quantization == "fp16"
+    assert isinstance(store.schema_index, faiss.IndexScalarQuantizer)
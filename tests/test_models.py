@@ -0,0 +1,88 @@
+"""
+Tests that the context agent models serialize to the original contextual data layout.
+"""
+
+from types import MappingProxyType
+
+from text2sql.agents.context_agent.models import (
+    ContextualData, FilterSpec, OutputColumn, TableMeta
+)
+
+# Dictionaries in the layout the enricher produced before the models existed
+FILTER_DICT = {
+    "filter_name": "status",
+    "column_name": "status",
+    "operator": "=",
+    "value": "open"
+}
+DATE_FILTER_DICT = {
+    "filter_name": "date_range",
+    "column_name": "created_at",
+    "operator": "BETWEEN",
+    "value": ["2024-01-01", "2024-01-31"]
+}
+TABLE_METADATA_DICT = {
+    "primary_table": "tickets",
+    "table_description": "Customer support tickets",
+    "table_fields": {"ticket_id": "INTEGER", "status": "VARCHAR(20)"}
+}
+OUTPUT_COLUMN_DICT = {
+    "column_name": "ticket_id",
+    "alias": "Ticket Id",
+    "column_description": "",
+    "column_fields": {
+        "data_type": "INTEGER",
+        "nullable": False
+    }
+}
+
+
+def test_filter_spec_to_dict():
+    filter_spec = FilterSpec(**FILTER_DICT)
+    
+    assert filter_spec.to_dict() == FILTER_DICT
+    assert FilterSpec(**DATE_FILTER_DICT).to_dict() == DATE_FILTER_DICT
+
+
+def test_table_meta_to_dict_copies_read_only_fields():
+    table_meta = TableMeta(
+        primary_table="tickets",
+        table_description="Customer support tickets",
+        table_fields=MappingProxyType(dict(TABLE_METADATA_DICT["table_fields"]))
+    )
+    
+    table_dict = table_meta.to_dict()
+    
+    assert table_dict == TABLE_METADATA_DICT
+    assert type(table_dict["table_fields"]) is dict
+
+
+def test_output_column_to_dict():
+    output_column = OutputColumn("ticket_id", "Ticket Id", "", "INTEGER", False)
+    
+    assert output_column.to_dict() == OUTPUT_COLUMN_DICT
+
+
+def test_contextual_data_to_dict_matches_original_layout():
+    contextual_data = ContextualData(
+        intent="count_tickets",
+        context={"description": "Open tickets", "expected_output": "Number of tickets"},
+        short_circuited=False,
+        table_metadata=TableMeta(
+            primary_table="tickets",
+            table_description="Customer support tickets",
+            table_fields=TABLE_METADATA_DICT["table_fields"]
+        ),
+        filters=[FilterSpec(**FILTER_DICT), FilterSpec(**DATE_FILTER_DICT)],
+        output_columns=[OutputColumn("ticket_id", "Ticket Id", "", "INTEGER", False)]
+    )
+    
+    # The original layout plus the short_circuited flag
+    assert contextual_data.to_dict() == {
+        "intent": "count_tickets",
+        "context": {"description": "Open tickets", "expected_output": "Number of tickets"},
+        "short_circuited": False,
+        "table_metadata": TABLE_METADATA_DICT,
+        "filters": [FILTER_DICT, DATE_FILTER_DICT],
+        "output_columns": [OUTPUT_COLUMN_DICT]
+    }
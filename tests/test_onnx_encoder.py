@@ -0,0 +1,54 @@
+"""
+Tests for the ONNX Runtime embedding encoder and its PyTorch fallback.
+"""
+
+import numpy as np
+import pytest
+
+pytest.importorskip("faiss")
+sentence_transformers = pytest.importorskip("sentence_transformers")
+
+from text2sql.metastore.metastore import MetaStore, _OnnxSentenceEncoder
+
+MODEL_NAME = "sentence-transformers/all-MiniLM-L6-v2"
+
+
+def _build_model(pooling_mode="mean", extra_modules=()):
+    models = sentence_transformers.models
+    transformer = models.Transformer(MODEL_NAME)
+    pooling = models.Pooling(transformer.get_word_embedding_dimension(), pooling_mode=pooling_mode)
+    return sentence_transformers.SentenceTransformer(modules=[transformer, pooling, *extra_modules])
+
+
+@pytest.mark.parametrize("pooling_mode, extra_modules", [
+    ("cls", ()),
+    ("max", ()),
+    ("mean", (sentence_transformers.models.Dense(384, 128),)),
+    ("mean", (sentence_transformers.models.Normalize(), sentence_transformers.models.Normalize())),
+])
+def test_rejects_unsupported_layouts(tmp_path, pooling_mode, extra_modules):
+    model = _build_model(pooling_mode, extra_modules)
+    
+    with pytest.raises(ValueError):
+        _OnnxSentenceEncoder(model, str(tmp_path / "model.onnx"))
+
+
+def test_load_onnx_encoder_falls_back_to_pytorch(tmp_path, monkeypatch):
+    monkeypatch.setattr("torch.cuda.is_available", lambda: False)
+    store = MetaStore.__new__(MetaStore)
+    store.vector_db_path = str(tmp_path)
+    store.embedding_model = _build_model("cls")
+    
+    assert store._load_onnx_encoder(MODEL_NAME) is store.embedding_model
+
+
+def test_matches_pytorch_embeddings(tmp_path):
+    pytest.importorskip("onnxruntime")
+    model = _build_model("mean", (sentence_transformers.models.Normalize(),))
+    texts = ["Table: tickets", "Column: status in table tickets with type VARCHAR(20)"]
+    
+    encoder = _OnnxSentenceEncoder(model, str(tmp_path / "model.onnx"))
+    
+    np.testing.assert_allclose(
+        encoder.encode(texts), model.encode(texts, convert_to_numpy=True), atol=1e-4
+    )
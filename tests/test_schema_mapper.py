@@ -0,0 +1,87 @@
+"""
+Tests for the SchemaMapper and FilterBuilder against a real MetaStore.
+"""
+
+import copy
+from pathlib import Path
+
+import orjson
+import pytest
+
+pytest.importorskip("faiss")
+pytest.importorskip("sentence_transformers")
+
+from conftest import TABLE_SCHEMAS
+from text2sql.agents.context_agent.schema_mapper import SchemaMapper
+from text2sql.agents.context_agent.filter_builder import FilterBuilder
+
+
+@pytest.fixture
+def schema_mapper(metastore, monkeypatch):
+    # The MetaStore has no table heads or SQL pairs search yet; report no matches
+    monkeypatch.setattr(metastore, "search_table_heads", lambda *args, **kwargs: [], raising=False)
+    monkeypatch.setattr(metastore, "find_similar_sql_pairs", lambda *args, **kwargs: [], raising=False)
+    return SchemaMapper(metastore)
+
+
+def test_map_entity_to_column(schema_mapper):
+    column_name, score = schema_mapper.map_entity_to_column("priority", "high", "tickets")
+    
+    assert column_name == "priority"
+    assert isinstance(score, float)
+
+
+def test_map_entities_batch_maps_each_distinct_entity(schema_mapper):
+    mappings = schema_mapper.map_entities_batch([
+        ("priority", "high", "tickets"),
+        ("status", "open", "tickets"),
+        ("priority", "high", "tickets")
+    ])
+    
+    assert [mapping[0] for mapping in mappings] == ["priority", "status", "priority"]
+
+
+def test_get_relevant_columns_searches_within_table(schema_mapper):
+    columns = schema_mapper.get_relevant_columns("customers", "customer name and email")
+    
+    assert columns
+    assert all(column["metadata"]["table_name"] == "customers" for column in columns)
+
+
+def test_build_filters_maps_unmapped_entities(schema_mapper):
+    filter_builder = FilterBuilder(schema_mapper)
+    
+    filters = filter_builder.build_filters(
+        [{"entity_type": "status", "entity_value": "not open"}], None, "tickets"
+    )
+    
+    assert [filter_spec.to_dict() for filter_spec in filters] == [
+        {"filter_name": "status", "column_name": "status", "operator": "!=", "value": "open"}
+    ]
+
+
+def test_heuristic_match_follows_reindex(schema_mapper, metastore):
+    assert schema_mapper._heuristic_match("status", "tickets") == ("status", 0.6)
+    
+    schema = copy.deepcopy(TABLE_SCHEMAS["tickets"])
+    schema["columns"][1]["name"] = "ticket_state"
+    Path(metastore.schema_dir, "tickets_schema.json").write_bytes(orjson.dumps(schema))
+    assert metastore.index_schema_data()
+    
+    assert schema_mapper._heuristic_match("status", "tickets") == ("ticket_state", 0.6)
+
+
+def test_confident_column_match_skips_fallback_searches(schema_mapper, monkeypatch):
+    calls = []
+    monkeypatch.setattr(schema_mapper.metastore, "search_table_heads",
+                        lambda *args, **kwargs: calls.append("table_heads") or [], raising=False)
+    monkeypatch.setattr(schema_mapper.metastore, "find_similar_sql_pairs",
+                        lambda *args, **kwargs: calls.append("sql_pairs") or [], raising=False)
+    
+    monkeypatch.setattr(schema_mapper, "_search_column_metadata", lambda *args: ("priority", 0.9))
+    assert schema_mapper.map_entity_to_column("priority", "high", "tickets") == ("priority", 0.9)
+    assert calls == []
+    
+    monkeypatch.setattr(schema_mapper, "_search_column_metadata", lambda *args: ("priority", 0.5))
+    assert schema_mapper.map_entity_to_column("priority", "low", "tickets") == ("priority", 0.5)
+    assert sorted(calls) == ["sql_pairs", "table_heads"]
@@ -0,0 +1,127 @@
+"""
+Tests for the SemanticSearchCache.
+"""
+
+import types
+
+import numpy as np
+import pytest
+
+from text2sql.agents.context_agent import semantic_cache
+from text2sql.agents.context_agent.semantic_cache import SemanticSearchCache
+
+# Unit vectors: "open tickets" and "open ticket" are near-duplicates (cosine 0.99),
+# "closed tickets" is unrelated to both
+EMBEDDINGS = {
+    "open tickets": np.array([1.0, 0.0, 0.0]),
+    "open ticket": np.array([0.99, np.sqrt(1 - 0.99 ** 2), 0.0]),
+    "tickets opened": np.array([0.9, np.sqrt(1 - 0.9 ** 2), 0.0]),
+    "closed tickets": np.array([0.0, 0.0, 1.0]),
+}
+
+
+class _Embedder:
+    """Looks queries up in EMBEDDINGS and records every call."""
+    
+    def __init__(self):
+        self.calls = []
+    
+    def __call__(self, query):
+        self.calls.append(query)
+        return EMBEDDINGS[query]
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [0.0]
+    monkeypatch.setattr(semantic_cache, "time", types.SimpleNamespace(monotonic=lambda: now[0]))
+    return now
+
+
+@pytest.fixture
+def embedder():
+    return _Embedder()
+
+
+def test_exact_hit(embedder):
+    cache = SemanticSearchCache(embedder)
+    cache.put("open tickets", 3, None, ["tickets"])
+    
+    assert cache.get("open tickets", 3) == ["tickets"]
+
+
+def test_near_duplicate_hit_at_threshold(embedder):
+    cache = SemanticSearchCache(embedder, similarity_threshold=0.99)
+    cache.put("open tickets", 3, None, ["tickets"])
+    
+    assert cache.get("open ticket", 3) == ["tickets"]
+
+
+def test_miss_below_threshold(embedder):
+    cache = SemanticSearchCache(embedder, similarity_threshold=0.95)
+    cache.put("open tickets", 3, None, ["tickets"])
+    
+    assert cache.get("tickets opened", 3) is None
+    assert cache.get("closed tickets", 3) is None
+
+
+def test_ttl_expiry(embedder, clock):
+    cache = SemanticSearchCache(embedder, ttl_seconds=10.0)
+    cache.put("open tickets", 3, None, ["tickets"])
+    
+    clock[0] = 10.0
+    assert cache.get("open tickets", 3) == ["tickets"]
+    clock[0] = 20.5
+    assert cache.get("open tickets", 3) is None
+    assert cache.get("open ticket", 3) is None
+
+
+def test_lru_eviction(embedder):
+    cache = SemanticSearchCache(embedder, max_entries=2)
+    cache.put("open tickets", 3, None, ["a"])
+    cache.put("closed tickets", 3, None, ["b"])
+    # Touch the oldest entry so the next put evicts "closed tickets"
+    assert cache.get("open tickets", 3) == ["a"]
+    cache.put("tickets opened", 3, None, ["c"])
+    
+    assert cache.get("closed tickets", 3) is None
+    assert cache.get("open tickets", 3) == ["a"]
+    assert cache.get("tickets opened", 3) == ["c"]
+
+
+def test_separates_top_k_and_filter(embedder):
+    cache = SemanticSearchCache(embedder)
+    cache.put("open tickets", 3, {"table": "tickets"}, ["filtered"])
+    
+    assert cache.get("open tickets", 5, {"table": "tickets"}) is None
+    assert cache.get("open tickets", 3) is None
+    assert cache.get("open ticket", 3, {"table": "orders"}) is None
+    assert cache.get("open ticket", 3, {"table": "tickets"}) == ["filtered"]
+
+
+def test_embeds_each_query_once(embedder):
+    cache = SemanticSearchCache(embedder)
+    
+    # Nothing cached: no embedding is needed to miss
+    assert cache.get("open tickets", 3) is None
+    cache.put("open tickets", 3, None, ["tickets"])
+    assert cache.get("closed tickets", 3) is None
+    cache.put("closed tickets", 3, None, ["closed"])
+    
+    assert embedder.calls == ["open tickets", "closed tickets"]
+
+
+def test_uses_precomputed_embedding(embedder):
+    cache = SemanticSearchCache(embedder)
+    cache.put("open tickets", 3, None, ["tickets"], embedding=EMBEDDINGS["open tickets"])
+    
+    assert cache.get("open ticket", 3, embedding=EMBEDDINGS["open ticket"]) == ["tickets"]
+    assert embedder.calls == []
+
+
+def test_invalidate(embedder):
+    cache = SemanticSearchCache(embedder)
+    cache.put("open tickets", 3, None, ["tickets"])
+    cache.invalidate()
+    
+    assert cache.get("open tickets", 3) is None
@@ -9,7 +9,6 @@ A web interface for the Text2SQL application, allowing users to:
 
 import os
 import streamlit as st
-import pandas as pd
 from loguru import logger
 
 # Import our application components
@@ -17,6 +16,9 @@ from utils.db_connection import DatabaseConnection
 from metastore.metastore import MetaStore
 # TODO: Import the actual query processing pipeline once it's implemented
 
+# Most rows fetched for display when executing a generated query
+MAX_DISPLAY_ROWS = 10000
+
 # Page configuration
 st.set_page_config(
     page_title="Text2SQL",
@@ -47,22 +49,28 @@ def connect_to_db(connection_string):
     return False, "Failed to connect to database"
 
 
+@st.cache_resource
+def get_metastore():
+    """Create the metastore once per server process and share it across reruns"""
+    # Paths relative to project root
+    vector_db_path = os.path.join("metastore", "vector_db")
+    schema_dir = os.path.join("metastore", "db_metadata")
+    table_heads_dir = os.path.join("metastore", "table_heads")
+    sql_pairs_dir = os.path.join("metastore", "sql_pairs")
+    
+    return MetaStore(
+        vector_db_path=vector_db_path,
+        schema_dir=schema_dir,
+        table_heads_dir=table_heads_dir,
+        sql_pairs_dir=sql_pairs_dir
+    )
+
+
 def load_metastore():
     """Load the metastore with database schema information"""
     try:
-        # Paths relative to project root
-        vector_db_path = os.path.join("metastore", "vector_db")
-        schema_dir = os.path.join("metastore", "db_metadata")
-        table_heads_dir = os.path.join("metastore", "table_heads")
-        sql_pairs_dir = os.path.join("metastore", "sql_pairs")
-        
         # Initialize metastore
-        metastore = MetaStore(
-            vector_db_path=vector_db_path,
-            schema_dir=schema_dir,
-            table_heads_dir=table_heads_dir,
-            sql_pairs_dir=sql_pairs_dir
-        )
+        metastore = get_metastore()
         
         # If we have a database connection, extract and save the schema
         if st.session_state.connected:
@@ -176,17 +184,18 @@ def main():
             # Execute the query
             if st.button("Execute SQL"):
                 with st.spinner("Executing query..."):
-                    success, results = st.session_state.db_connection.execute_query(latest_query["sql"])
+                    success, results = st.session_state.db_connection.query_dataframe(
+                        latest_query["sql"], max_rows=MAX_DISPLAY_ROWS
+                    )
                     
                     # Store results in history
                     latest_query["results"] = results if success else {"error": results}
                     
                     if success:
-                        if "rows" in results:
+                        if "dataframe" in results:
                             st.subheader("Query Results")
-                            # Convert to DataFrame for display
-                            df = pd.DataFrame(results["rows"], columns=results["columns"])
-                            st.dataframe(df)
+                            # Arrow-backed, so Streamlit serializes it without conversion
+                            st.dataframe(results["dataframe"])
                         else:
                             st.success(results["message"])
                     else:
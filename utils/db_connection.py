@@ -4,13 +4,30 @@ Handles PostgreSQL connections using SQLAlchemy.
 """
 
 import os
-from typing import Dict, Optional, Any
+import functools
+from typing import Dict, Optional, Any, IO
+import pandas as pd
 import sqlalchemy as sa
 from sqlalchemy import create_engine, MetaData, inspect
 from sqlalchemy.engine import Engine
-from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.exc import ResourceClosedError, SQLAlchemyError
 from loguru import logger
 
+# Connection pool settings: pooled and overflow connections, and seconds after
+# which a pooled connection is replaced
+POOL_SIZE = 5
+MAX_OVERFLOW = 10
+POOL_RECYCLE = 3600
+
+# Rows fetched per round-trip when a query result is streamed
+FETCH_BATCH_SIZE = 1000
+
+
+@functools.lru_cache(maxsize=256)
+def _text_clause(query: str) -> sa.TextClause:
+    """Build the TextClause for a query once; repeated queries reuse it."""
+    return sa.text(query)
+
 
 class DatabaseConnection:
     """Manages database connections for the Text2SQL application."""
@@ -26,6 +43,7 @@ class DatabaseConnection:
         self.engine: Optional[Engine] = None
         self.metadata: Optional[MetaData] = None
         self.inspector = None
+        self._reflected = False
     
     def connect(self) -> bool:
         """
@@ -39,13 +57,20 @@ class DatabaseConnection:
             return False
         
         try:
-            self.engine = create_engine(self.connection_string)
+            self.engine = create_engine(
+                self.connection_string,
+                pool_size=POOL_SIZE,
+                max_overflow=MAX_OVERFLOW,
+                pool_pre_ping=True,
+                pool_recycle=POOL_RECYCLE
+            )
             # Test connection
             with self.engine.connect() as conn:
                 conn.execute(sa.text("SELECT 1"))
             
+            # Tables are reflected on first use of metadata_reflected, not here
             self.metadata = MetaData()
-            self.metadata.reflect(bind=self.engine)
+            self._reflected = False
             self.inspector = inspect(self.engine)
             
             logger.info(f"Successfully connected to database")
@@ -55,6 +80,23 @@ class DatabaseConnection:
             logger.error(f"Database connection error: {str(e)}")
             return False
     
+    @property
+    def metadata_reflected(self) -> Optional[MetaData]:
+        """
+        Table metadata for the whole database, reflected on first access.
+        
+        Returns:
+            MetaData: The reflected metadata, or None if not connected
+        """
+        if not self.engine or self.metadata is None:
+            logger.error("Not connected to database")
+            return None
+        
+        if not self._reflected:
+            self.metadata.reflect(bind=self.engine)
+            self._reflected = True
+        return self.metadata
+    
     def get_tables(self) -> list:
         """
         Get list of tables in the database.
@@ -79,26 +121,30 @@ class DatabaseConnection:
             logger.error("Not connected to database")
             return {}
         
+        # Reflect every table in one query per kind instead of three per table;
+        # results are keyed by (schema, table_name) with None for the default schema
+        columns = self.inspector.get_multi_columns()
+        primary_keys = self.inspector.get_multi_pk_constraint()
+        foreign_keys = self.inspector.get_multi_foreign_keys()
+        
         schema_info = {}
         for table_name in self.get_tables():
-            columns = self.inspector.get_columns(table_name)
-            primary_keys = self.inspector.get_pk_constraint(table_name)
-            foreign_keys = self.inspector.get_foreign_keys(table_name)
-            
+            key = (None, table_name)
             schema_info[table_name] = {
-                "columns": columns,
-                "primary_keys": primary_keys,
-                "foreign_keys": foreign_keys
+                "columns": columns.get(key, []),
+                "primary_keys": primary_keys.get(key, {}),
+                "foreign_keys": foreign_keys.get(key, [])
             }
         
         return schema_info
     
-    def execute_query(self, query: str) -> tuple:
+    def execute_query(self, query: str, max_rows: Optional[int] = None) -> tuple:
         """
         Execute a SQL query and return results.
         
         Args:
             query: SQL query string to execute
+            max_rows: Stream the result and return at most this many rows, or None for all
             
         Returns:
             tuple: (success, results or error message)
@@ -108,13 +154,96 @@ class DatabaseConnection:
         
         try:
             with self.engine.connect() as conn:
-                result = conn.execute(sa.text(query))
+                if max_rows is not None:
+                    conn = conn.execution_options(stream_results=True)
+                result = conn.execute(_text_clause(query))
                 if result.returns_rows:
                     columns = result.keys()
-                    rows = result.fetchall()
+                    if max_rows is None:
+                        rows = result.fetchall()
+                    else:
+                        rows = []
+                        while len(rows) < max_rows:
+                            batch = result.fetchmany(min(FETCH_BATCH_SIZE, max_rows - len(rows)))
+                            if not batch:
+                                break
+                            rows.extend(batch)
                     return True, {"columns": columns, "rows": rows}
                 return True, {"message": "Query executed successfully"}
                 
         except SQLAlchemyError as e:
             logger.error(f"Query execution error: {str(e)}")
-            return False, str(e)
\ No newline at end of file
+            return False, str(e)
+    
+    def query_dataframe(self, query: str, max_rows: Optional[int] = None) -> tuple:
+        """
+        Execute a query and return its result as an Arrow-backed DataFrame.
+        
+        Statements that return no rows (INSERT, UPDATE, DDL) get the same
+        message result as execute_query.
+        
+        Args:
+            query: SQL query string to execute
+            max_rows: Stream the result and return at most this many rows, or None for all
+            
+        Returns:
+            tuple: (success, {"dataframe": DataFrame}, {"message": str} or error message)
+        """
+        if not self.engine:
+            return False, "Not connected to database"
+        
+        try:
+            with self.engine.connect() as conn:
+                if max_rows is None:
+                    df = pd.read_sql_query(_text_clause(query), conn, dtype_backend="pyarrow")
+                    return True, {"dataframe": df}
+                
+                conn = conn.execution_options(stream_results=True)
+                chunks = []
+                fetched = 0
+                for chunk in pd.read_sql_query(_text_clause(query), conn, dtype_backend="pyarrow",
+                                               chunksize=FETCH_BATCH_SIZE):
+                    chunks.append(chunk)
+                    fetched += len(chunk)
+                    if fetched >= max_rows:
+                        break
+                df = pd.concat(chunks, ignore_index=True).head(max_rows) if chunks else pd.DataFrame()
+                return True, {"dataframe": df}
+                
+        except ResourceClosedError:
+            # pandas raises this once it tries to read rows from a statement without any
+            return True, {"message": "Query executed successfully"}
+        except SQLAlchemyError as e:
+            logger.error(f"Query execution error: {str(e)}")
+            return False, str(e)
+    
+    def copy_query_to_csv(self, query: str, output: IO[bytes]) -> bool:
+        """
+        Stream the result of a query into a file as CSV using PostgreSQL COPY.
+        
+        The rows are serialized by the server and written straight to the
+        file, without building Python row objects.
+        
+        Args:
+            query: SELECT query whose result should be copied
+            output: Binary file object to write the CSV (with header) to
+            
+        Returns:
+            bool: True if successful, False otherwise
+        """
+        if not self.engine:
+            logger.error("Not connected to database")
+            return False
+        
+        raw_conn = self.engine.raw_connection()
+        try:
+            with raw_conn.cursor() as cursor:
+                cursor.copy_expert(f"COPY ({query}) TO STDOUT WITH CSV HEADER", output)
+            raw_conn.commit()
+            return True
+        except Exception as e:
+            raw_conn.rollback()
+            logger.error(f"COPY execution error: {str(e)}")
+            return False
+        finally:
+            raw_conn.close()